@@ -0,0 +1,177 @@
+"""Baseline schema as previously created by Base.metadata.create_all
+
+Revision ID: 0001_baseline_schema
+Revises:
+Create Date: 2026-10-18
+
+Databases that were bootstrapped by create_all already have these tables, so
+each table is only created when it is missing. Running `alembic upgrade head`
+is therefore safe on both fresh and existing databases.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_baseline_schema"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _missing(table_name: str) -> bool:
+    # Offline (--sql) runs have no connection to inspect; emit every table
+    if context.is_offline_mode():
+        return True
+    return not sa.inspect(op.get_bind()).has_table(table_name)
+
+
+def upgrade() -> None:
+    if _missing("leagues"):
+        op.create_table(
+            "leagues",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("league_type", sa.Enum("SUNCOAST", "MEXICAN", name="leaguetypeenum"), nullable=False),
+            sa.Column("season", sa.String(), nullable=False),
+            sa.Column("division", sa.String(), nullable=True),
+            sa.Column("is_active", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_leagues_id", "leagues", ["id"])
+
+    if _missing("teams"):
+        op.create_table(
+            "teams",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("league_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("leagues.id"), nullable=False),
+            sa.Column("is_active", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_teams_id", "teams", ["id"])
+
+    if _missing("league_standings"):
+        op.create_table(
+            "league_standings",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("league_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("leagues.id"), nullable=False),
+            sa.Column("team_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("teams.id"), nullable=False),
+            sa.Column("matches_played", sa.Integer(), nullable=True),
+            sa.Column("wins", sa.Integer(), nullable=True),
+            sa.Column("draws", sa.Integer(), nullable=True),
+            sa.Column("losses", sa.Integer(), nullable=True),
+            sa.Column("goals_for", sa.Integer(), nullable=True),
+            sa.Column("goals_against", sa.Integer(), nullable=True),
+            sa.Column("goal_difference", sa.Integer(), nullable=True),
+            sa.Column("points", sa.Integer(), nullable=True),
+            sa.Column("position", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_league_standings_id", "league_standings", ["id"])
+
+    if _missing("matches"):
+        op.create_table(
+            "matches",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("match_date", sa.DateTime(), nullable=False),
+            sa.Column("match_time", sa.String(), nullable=True),
+            sa.Column("home_team_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("teams.id"), nullable=False),
+            sa.Column("away_team_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("teams.id"), nullable=False),
+            sa.Column("league_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("leagues.id"), nullable=False),
+            sa.Column("venue_name", sa.String(), nullable=True),
+            sa.Column("field_name", sa.String(), nullable=True),
+            sa.Column("full_location", sa.String(), nullable=True),
+            sa.Column("match_type", sa.String(), nullable=True),
+            sa.Column("division", sa.String(), nullable=True),
+            sa.Column("home_score", sa.Integer(), nullable=True),
+            sa.Column("away_score", sa.Integer(), nullable=True),
+            sa.Column(
+                "status",
+                sa.Enum("SCHEDULED", "IN_PROGRESS", "COMPLETED", "POSTPONED", "CANCELLED", name="matchstatusenum"),
+                nullable=True,
+            ),
+            sa.Column("notes", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_matches_id", "matches", ["id"])
+
+    if _missing("players"):
+        op.create_table(
+            "players",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("first_name", sa.String(), nullable=False),
+            sa.Column("last_name", sa.String(), nullable=False),
+            sa.Column("position", sa.String(), nullable=False),
+            sa.Column("jersey_number", sa.Integer(), nullable=True),
+            sa.Column("email", sa.String(), nullable=True),
+            sa.Column("phone_number", sa.String(), nullable=True),
+            sa.Column("profile_image_url", sa.String(), nullable=True),
+            sa.Column("is_captain", sa.Boolean(), nullable=False),
+            sa.Column("status", sa.Integer(), nullable=False),
+            sa.Column("goals", sa.Integer(), nullable=True),
+            sa.Column("assists", sa.Integer(), nullable=True),
+            sa.Column("clean_sheets", sa.Integer(), nullable=True),
+            sa.Column("appearances", sa.Integer(), nullable=True),
+            sa.Column("yellow_cards", sa.Integer(), nullable=True),
+            sa.Column("red_cards", sa.Integer(), nullable=True),
+            sa.Column("joined_at", sa.DateTime(), nullable=True),
+            sa.Column("left_at", sa.DateTime(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_players_id", "players", ["id"])
+
+    if _missing("users"):
+        op.create_table(
+            "users",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("hashed_password", sa.String(), nullable=False),
+            sa.Column("is_admin", sa.Boolean(), nullable=True),
+            sa.Column("player_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("players.id"), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if _missing("posts"):
+        op.create_table(
+            "posts",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("title", sa.String(length=255), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("content", sa.Text(), nullable=True),
+            sa.Column("is_published", sa.Boolean(), nullable=True),
+            sa.Column("published_at", sa.DateTime(), nullable=True),
+            sa.Column("thumbnail_url", sa.String(), nullable=True),
+            sa.Column("author_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("posts")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_table("users")
+    op.drop_index("ix_players_id", table_name="players")
+    op.drop_table("players")
+    op.drop_index("ix_matches_id", table_name="matches")
+    op.drop_table("matches")
+    op.drop_index("ix_league_standings_id", table_name="league_standings")
+    op.drop_table("league_standings")
+    op.drop_index("ix_teams_id", table_name="teams")
+    op.drop_table("teams")
+    op.drop_index("ix_leagues_id", table_name="leagues")
+    op.drop_table("leagues")
+    sa.Enum(name="matchstatusenum").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="leaguetypeenum").drop(op.get_bind(), checkfirst=True)
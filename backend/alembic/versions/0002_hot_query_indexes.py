@@ -0,0 +1,37 @@
+"""Composite indexes for the hot match, standings, roster and blog queries
+
+Revision ID: 0002_hot_query_indexes
+Revises: 0001_baseline_schema
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_hot_query_indexes"
+down_revision: Union[str, None] = "0001_baseline_schema"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+HOT_QUERY_INDEXES = [
+    ("ix_matches_league_id_match_date", "matches", ["league_id", "match_date"]),
+    ("ix_matches_home_team_status_date", "matches", ["home_team_id", "status", "match_date"]),
+    ("ix_matches_away_team_status_date", "matches", ["away_team_id", "status", "match_date"]),
+    ("ix_league_standings_league_id_position", "league_standings", ["league_id", "position"]),
+    ("ix_players_status_goals_assists", "players", ["status", "goals", "assists"]),
+    ("ix_posts_is_published_created_at", "posts", ["is_published", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in HOT_QUERY_INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(HOT_QUERY_INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,57 @@
+"""Per-matchday standings snapshots
+
+Revision ID: 0003_standings_snapshots
+Revises: 0002_hot_query_indexes
+Create Date: 2026-10-18
+
+Run `python backfill_standings_snapshots.py` afterwards to fill in past
+seasons.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_standings_snapshots"
+down_revision: Union[str, None] = "0002_hot_query_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _missing(table_name: str) -> bool:
+    # Offline (--sql) runs have no connection to inspect; emit every table
+    if context.is_offline_mode():
+        return True
+    return not sa.inspect(op.get_bind()).has_table(table_name)
+
+
+def upgrade() -> None:
+    # Databases bootstrapped by create_all (DB_AUTO_CREATE) already have the table
+    if _missing("standings_snapshots"):
+        op.create_table(
+            "standings_snapshots",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("league_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("leagues.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("team_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("teams.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("matchday", sa.Date(), nullable=False),
+            sa.Column("matches_played", sa.Integer(), nullable=True),
+            sa.Column("wins", sa.Integer(), nullable=True),
+            sa.Column("draws", sa.Integer(), nullable=True),
+            sa.Column("losses", sa.Integer(), nullable=True),
+            sa.Column("goals_for", sa.Integer(), nullable=True),
+            sa.Column("goals_against", sa.Integer(), nullable=True),
+            sa.Column("goal_difference", sa.Integer(), nullable=True),
+            sa.Column("points", sa.Integer(), nullable=True),
+            sa.Column("position", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+            sa.UniqueConstraint("league_id", "matchday", "team_id", name="uq_standings_snapshots_league_matchday_team"),
+        )
+        op.create_index("ix_standings_snapshots_league_id_matchday", "standings_snapshots", ["league_id", "matchday"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_standings_snapshots_league_id_matchday", table_name="standings_snapshots")
+    op.drop_table("standings_snapshots")
@@ -0,0 +1,43 @@
+"""Revoked refresh tokens
+
+Revision ID: 0004_revoked_tokens
+Revises: 0003_standings_snapshots
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_revoked_tokens"
+down_revision: Union[str, None] = "0003_standings_snapshots"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _missing(table_name: str) -> bool:
+    # Offline (--sql) runs have no connection to inspect; emit every table
+    if context.is_offline_mode():
+        return True
+    return not sa.inspect(op.get_bind()).has_table(table_name)
+
+
+def upgrade() -> None:
+    # Databases bootstrapped by create_all (DB_AUTO_CREATE) already have the table
+    if _missing("revoked_tokens"):
+        op.create_table(
+            "revoked_tokens",
+            sa.Column("jti", sa.String(length=64), primary_key=True),
+            sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("expires_at", sa.DateTime(), nullable=False),
+            sa.Column("revoked_at", sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        )
+        op.create_index("ix_revoked_tokens_expires_at", "revoked_tokens", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_revoked_tokens_expires_at", table_name="revoked_tokens")
+    op.drop_table("revoked_tokens")
@@ -2,6 +2,12 @@ from uuid import UUID
 from fastapi import APIRouter
 from app.schemas.admin import UpdatePlayerStats
 from app.db.deps import get_db
+from app.core.cache import invalidate_on_commit
+from app.core.perf import SLOW_QUERY_MS, route_stats
+from app.db.pool import pool_metrics
+from app.db.session import engine, replica_engines, DB_POOL_MODE
+from app.deps.auth import get_current_admin_user
+from app.models.user import User
 from sqlalchemy.orm import Session
 from fastapi import Depends
 from app.models.player import Player
@@ -15,6 +21,20 @@ def get_admin():
     return {"message": "Hello, World!"}
 
 
+@router.get("/admin/db-pool")
+def get_db_pool_metrics(current_user: User = Depends(get_current_admin_user)):
+    metrics = {"mode": DB_POOL_MODE, **pool_metrics(engine)}
+    if replica_engines:
+        metrics["replicas"] = [pool_metrics(replica) for replica in replica_engines]
+    return metrics
+
+
+@router.get("/admin/perf")
+def get_perf(current_user: User = Depends(get_current_admin_user)):
+    """Rolling query count, database time and request time per route, most database time first"""
+    return {"slow_query_ms": SLOW_QUERY_MS, "routes": route_stats()}
+
+
 @router.put("/admin/update-player-stats/{player_id}")
 def update_player_stats(player_id: UUID, player_stats: UpdatePlayerStats, db: Session = Depends(get_db)):
     player = db.query(Player).filter(Player.id == player_id).first()
@@ -33,8 +53,8 @@ def update_player_stats(player_id: UUID, player_stats: UpdatePlayerStats, db: Se
     player.red_cards = player_stats.red_cards
     player.updated_at = datetime.now()
 
+    invalidate_on_commit(db, "players")
     db.commit()
-    db.refresh(player)
 
     return player
 
@@ -0,0 +1,162 @@
+"""
+Async versions of the high-traffic read routes.
+
+Mounted ahead of the sync routers when DB_ASYNC_ROUTES is on, so these
+handlers answer the same paths with an AsyncSession and never occupy a
+threadpool slot while waiting on the database. Responses, cache tags and
+loader profiles match the sync routes in match.py, league.py, player.py and
+blog_posts.py. Helpers that are written against the sync Session API
+(keyset pagination, the club timeline) run through AsyncSession.run_sync.
+"""
+
+from datetime import date, datetime
+from typing import List, Optional, Union
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.routes.match import CLUB_FIXTURES_TTL, EMBEDDED, club_tags
+from app.core.cache import cached
+from app.db.async_session import get_async_db
+from app.db.fieldsets import narrow, parse_fields, shape, shape_page
+from app.db.loaders import load_fields, load_for
+from app.db.pagination import keyset_page
+from app.models.blog_posts import Post
+from app.models.league_standings import LeagueStandings
+from app.models.match_new import Match
+from app.models.player import Player
+from app.models.standings_snapshot import StandingsSnapshot
+from app.schemas.blog_posts import BlogPostList
+from app.schemas.league import LeagueStandingsWithTeam, StandingsSnapshotWithTeam
+from app.schemas.match import MatchPage, MatchWithTeamsAndLeague
+from app.schemas.player import PlayerRead
+from app.services import club_timeline
+
+router = APIRouter()
+
+
+@router.get("/api/matches/", response_model=Union[List[MatchWithTeamsAndLeague], MatchPage], tags=["match"])
+@cached(Union[List[MatchWithTeamsAndLeague], MatchPage], "matches", *EMBEDDED)
+async def get_matches(
+    skip: int = 0, limit: int = 100, after: Optional[str] = None, fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    fieldset = parse_fields(fields, MatchWithTeamsAndLeague, Match)
+    # Passing `after` (empty for the first page) switches to cursor pagination
+    if after is not None:
+        matches, next_cursor = await db.run_sync(lambda session: keyset_page(
+            load_fields(session.query(Match), MatchWithTeamsAndLeague, fieldset, Match.match_date),
+            Match.match_date, Match.id, after, limit,
+        ))
+        return shape_page(fieldset, matches, next_cursor)
+    result = await db.scalars(load_fields(select(Match), MatchWithTeamsAndLeague, fieldset).offset(skip).limit(limit))
+    return shape(fieldset, result.all())
+
+
+@router.get("/api/matches/league/{league_id}", response_model=List[MatchWithTeamsAndLeague], tags=["match"])
+@cached(List[MatchWithTeamsAndLeague], "league:{league_id}", *EMBEDDED)
+async def get_matches_by_league(league_id: UUID, fields: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    fieldset = parse_fields(fields, MatchWithTeamsAndLeague, Match)
+    result = await db.scalars(
+        load_fields(select(Match), MatchWithTeamsAndLeague, fieldset)
+        .where(Match.league_id == league_id)
+        .order_by(Match.match_date.asc())
+    )
+    return shape(fieldset, result.all())
+
+
+@router.get("/api/matches/team/{team_id}", response_model=List[MatchWithTeamsAndLeague], tags=["match"])
+@cached(List[MatchWithTeamsAndLeague], "team:{team_id}", *EMBEDDED)
+async def get_matches_by_team(team_id: UUID, fields: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    fieldset = parse_fields(fields, MatchWithTeamsAndLeague, Match)
+    result = await db.scalars(
+        load_fields(select(Match), MatchWithTeamsAndLeague, fieldset)
+        .where((Match.home_team_id == team_id) | (Match.away_team_id == team_id))
+        .order_by(Match.match_date.asc())
+    )
+    return shape(fieldset, result.all())
+
+
+async def _club_matches(db: AsyncSession, match_ids: List[UUID], newest_first: bool, fields: Optional[str]):
+    fieldset = parse_fields(fields, MatchWithTeamsAndLeague, Match)
+    if not match_ids:
+        return []
+    order = Match.match_date.desc() if newest_first else Match.match_date.asc()
+    result = await db.scalars(
+        load_fields(select(Match), MatchWithTeamsAndLeague, fieldset).where(Match.id.in_(match_ids)).order_by(order)
+    )
+    return shape(fieldset, result.all())
+
+
+@router.get("/api/matches/upcoming", response_model=List[MatchWithTeamsAndLeague], tags=["match"])
+@cached(List[MatchWithTeamsAndLeague], club_tags, *EMBEDDED, ttl=CLUB_FIXTURES_TTL)
+async def get_upcoming_matches(limit: int = 10, fields: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    timeline = await db.run_sync(club_timeline.get_timeline)
+    return await _club_matches(db, timeline.upcoming(datetime.now(), limit), newest_first=False, fields=fields)
+
+
+@router.get("/api/matches/recent", response_model=List[MatchWithTeamsAndLeague], tags=["match"])
+@cached(List[MatchWithTeamsAndLeague], club_tags, *EMBEDDED, ttl=CLUB_FIXTURES_TTL)
+async def get_recent_matches(limit: int = 10, fields: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    timeline = await db.run_sync(club_timeline.get_timeline)
+    return await _club_matches(db, timeline.recent(datetime.now(), limit), newest_first=True, fields=fields)
+
+
+@router.get("/api/standings/league/{league_id}", response_model=List[LeagueStandingsWithTeam], tags=["league"])
+@cached(List[LeagueStandingsWithTeam], "league:{league_id}")
+async def get_standings_by_league(league_id: UUID, as_of: Optional[date] = None, db: AsyncSession = Depends(get_async_db)):
+    # The table as it stood after the last matchday on or before `as_of`
+    if as_of is not None:
+        matchday = await db.scalar(select(func.max(StandingsSnapshot.matchday)).where(
+            StandingsSnapshot.league_id == league_id,
+            StandingsSnapshot.matchday <= as_of,
+        ))
+        if matchday is None:
+            return []
+        result = await db.scalars(
+            load_for(select(StandingsSnapshot), StandingsSnapshotWithTeam)
+            .where(StandingsSnapshot.league_id == league_id, StandingsSnapshot.matchday == matchday)
+            .order_by(StandingsSnapshot.position.asc())
+        )
+        return result.all()
+
+    result = await db.scalars(
+        load_for(select(LeagueStandings), LeagueStandingsWithTeam)
+        .where(LeagueStandings.league_id == league_id)
+        .order_by(LeagueStandings.position.asc())
+    )
+    return result.all()
+
+
+@router.get("/players/roster", response_model=list[PlayerRead], tags=["players"])
+@cached(list[PlayerRead], "players")
+async def get_roster(fields: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    fieldset = parse_fields(fields, PlayerRead, Player)
+    result = await db.scalars(
+        narrow(select(Player), fieldset)
+        .where(Player.status == 1).order_by(Player.goals.desc(), Player.assists.desc())
+    )
+    return shape(fieldset, result.all())
+
+
+@router.get("/blog-posts/", response_model=BlogPostList, tags=["blog-posts"])
+@cached(BlogPostList, "posts")
+async def list_blog_posts(
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = 0,
+    limit: int = 10,
+    after: Optional[str] = None
+):
+    next_cursor = None
+    # Passing `after` (empty for the first page) switches to cursor pagination, newest first
+    if after is not None:
+        posts, next_cursor = await db.run_sync(lambda session: keyset_page(
+            session.query(Post), Post.created_at, Post.id, after, limit, descending=True
+        ))
+    else:
+        posts = (await db.scalars(select(Post).offset(skip).limit(limit))).all()
+    total = await db.scalar(select(func.count()).select_from(Post))
+    # Serialized once, from the ORM rows, on the way out
+    return {"posts": posts, "total": total, "next_cursor": next_cursor}
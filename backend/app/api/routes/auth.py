@@ -3,9 +3,10 @@ from app.models.user import User
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.db.deps import get_db
-from app.schemas.user import UserCreate, UserRead, TokenResponse, UserLogin
+from app.schemas.user import UserCreate, UserRead, TokenResponse, UserLogin, RefreshRequest
 from app.services.user_service import create_user
 from app.services.auth_service import authenticate_user
+from app.services.token_service import refresh_tokens, logout
 
 
 router = APIRouter()
@@ -15,14 +16,24 @@ def health_check():
     return "healthy"
 
 @router.post("/register", response_model=UserRead)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
-    user = create_user(db, user)
+async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+    user = await create_user(db, user)
     return user
 
 @router.post("/login", response_model=TokenResponse)
-def login_user(login_data: UserLogin, db: Session = Depends(get_db)):
-    token, user = authenticate_user(db, login_data)
-    return {"access_token": token, "user": user}
+async def login_user(login_data: UserLogin, db: Session = Depends(get_db)):
+    tokens, user = await authenticate_user(db, login_data)
+    return {**tokens, "user": user}
+
+@router.post("/refresh", response_model=TokenResponse)
+def refresh(refresh_data: RefreshRequest, db: Session = Depends(get_db)):
+    tokens, user = refresh_tokens(db, refresh_data.refresh_token)
+    return {**tokens, "user": user}
+
+@router.post("/logout")
+def logout_user(refresh_data: RefreshRequest, db: Session = Depends(get_db)):
+    logout(db, refresh_data.refresh_token)
+    return {"message": "Logged out"}
 
 @router.get("/me", response_model=UserRead)
 def get_me(current_user: User = Depends(get_current_user)):
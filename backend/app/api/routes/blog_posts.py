@@ -3,7 +3,10 @@ from app.deps.auth import get_current_user
 from app.models.user import User
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.db.deps import get_db
+from app.core.cache import cached, invalidate_on_commit
+from app.db.pagination import keyset_page
 from app.models.blog_posts import Post
 from app.schemas.blog_posts import BlogPostCreate, BlogPostRead, BlogPostUpdate, BlogPostList
 
@@ -19,22 +22,30 @@ def create_blog_post(
 ):
     db_post = Post(**post.dict(), author_id=current_user.id)
     db.add(db_post)
+    invalidate_on_commit(db, "posts")
     db.commit()
-    db.refresh(db_post)
     return db_post
 
 @router.get("/", response_model=BlogPostList)
+@cached(BlogPostList, "posts")
 def list_blog_posts(
     db: Session = Depends(get_db),
     skip: int = 0,
-    limit: int = 10
+    limit: int = 10,
+    after: Optional[str] = None
 ):
-    posts = db.query(Post).offset(skip).limit(limit).all()
+    next_cursor = None
+    # Passing `after` (empty for the first page) switches to cursor pagination, newest first
+    if after is not None:
+        posts, next_cursor = keyset_page(db.query(Post), Post.created_at, Post.id, after, limit, descending=True)
+    else:
+        posts = db.query(Post).offset(skip).limit(limit).all()
     total = db.query(Post).count()
-    validated_posts = [BlogPostRead.model_validate(p, from_attributes=True) for p in posts]
-    return BlogPostList(posts=validated_posts, total=total)
+    # Serialized once, from the ORM rows, on the way out
+    return {"posts": posts, "total": total, "next_cursor": next_cursor}
 
 @router.get("/{post_id}", response_model=BlogPostRead)
+@cached(BlogPostRead, "post:{post_id}")
 def read_blog_post(
     post_id: str,
     db: Session = Depends(get_db)
@@ -57,8 +68,8 @@ def update_blog_post(
     for key, value in post.dict(exclude_unset=True).items():
         setattr(db_post, key, value)
     
+    invalidate_on_commit(db, "posts", f"post:{post_id}")
     db.commit()
-    db.refresh(db_post)
     return db_post
 
 @router.delete("/{post_id}", response_model=BlogPostRead)
@@ -70,6 +81,7 @@ def delete_blog_post(
     if not db_post:
         raise HTTPException(status_code=404, detail="Post not found")
     
+    invalidate_on_commit(db, "posts", f"post:{post_id}")
     db.delete(db_post)
     db.commit()
     return db_post
\ No newline at end of file
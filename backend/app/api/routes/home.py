@@ -0,0 +1,103 @@
+"""
+The homepage in one request.
+
+GET /api/home returns what the home page used to fetch in five requests:
+the club's upcoming and recent fixtures, the table of each league the club
+plays in, the roster and the latest blog posts. The sections are built
+concurrently, each on its own session from the threadpool (the request's own
+session builds one of them), so the response takes about as long as the
+slowest section rather than the sum. A home request therefore holds up to
+four pooled connections for a moment; size DB_POOL_SIZE with that in mind.
+
+The bundle is cached as one entry. Its tags cover every section: the club
+teams, "standings" (bumped by any standings or match write), "players",
+"posts", and the team and league names embedded in the payload.
+"""
+
+import asyncio
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.api.routes.match import CLUB_FIXTURES_TTL, EMBEDDED, club_tags
+from app.core.cache import cached
+from app.db.loaders import load_for
+from app.db.session import get_db, sibling_session
+from app.models.blog_posts import Post
+from app.models.league import League
+from app.models.league_standings import LeagueStandings
+from app.models.match_new import Match
+from app.models.player import Player
+from app.models.team import Team
+from app.schemas.home import HomeBundle
+from app.schemas.league import LeagueStandingsWithTeam
+from app.schemas.match import MatchWithTeamsAndLeague
+from app.services import club_timeline
+
+router = APIRouter()
+
+
+def _fixtures(db: Session, limit: int):
+    """(upcoming, recent) for the club teams, from one timeline and one query"""
+    now = datetime.now()
+    timeline = club_timeline.get_timeline(db)
+    upcoming_ids, recent_ids = timeline.upcoming(now, limit), timeline.recent(now, limit)
+    if not upcoming_ids and not recent_ids:
+        return [], []
+    matches = {
+        match.id: match
+        for match in load_for(db.query(Match), MatchWithTeamsAndLeague).filter(Match.id.in_(upcoming_ids + recent_ids))
+    }
+    return [matches[i] for i in upcoming_ids if i in matches], [matches[i] for i in recent_ids if i in matches]
+
+
+def _tables(db: Session, table_rows: int):
+    leagues = db.query(League).join(Team, Team.league_id == League.id).filter(
+        Team.id.in_(club_timeline.CLUB_TEAM_IDS)
+    ).order_by(League.league_type, League.name).all()
+    if not leagues:
+        return []
+    rows = load_for(db.query(LeagueStandings), LeagueStandingsWithTeam).filter(
+        LeagueStandings.league_id.in_([league.id for league in leagues])
+    ).order_by(LeagueStandings.position.asc()).all()
+    tables = {league.id: [] for league in leagues}
+    for row in rows:
+        if len(tables[row.league_id]) < table_rows:
+            tables[row.league_id].append(row)
+    return [{"league": league, "standings": tables[league.id]} for league in leagues]
+
+
+def _roster(db: Session):
+    return db.query(Player).filter(Player.status == 1).order_by(Player.goals.desc(), Player.assists.desc()).all()
+
+
+def _posts(db: Session, posts: int):
+    return db.query(Post).order_by(Post.created_at.desc(), Post.id.desc()).limit(posts).all()
+
+
+def _build(db: Session, section, *args):
+    """Run one section on its own session, reading from the same database as `db`"""
+    session = sibling_session(db)
+    try:
+        return section(session, *args)
+    finally:
+        session.close()
+
+
+@router.get("/home", response_model=HomeBundle)
+@cached(HomeBundle, club_tags, "standings", "players", "posts", *EMBEDDED, ttl=CLUB_FIXTURES_TTL)
+async def get_home(
+    limit: int = Query(5, ge=1, le=20),
+    table_rows: int = Query(4, ge=1, le=30),
+    posts: int = Query(3, ge=1, le=10),
+    db: Session = Depends(get_db),
+):
+    (upcoming, recent), tables, roster, latest_posts = await asyncio.gather(
+        run_in_threadpool(_fixtures, db, limit),
+        run_in_threadpool(_build, db, _tables, table_rows),
+        run_in_threadpool(_build, db, _roster),
+        run_in_threadpool(_build, db, _posts, posts),
+    )
+    return {"upcoming": upcoming, "recent": recent, "standings": tables, "roster": roster, "posts": latest_posts}
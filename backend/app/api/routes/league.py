@@ -1,17 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
 from uuid import UUID
+from datetime import date
 
+from app.core.cache import cached, conditional, invalidate_on_commit
 from app.db.session import get_db
+from app.db.loaders import load_for
+from app.db.pagination import keyset_page
+from app.services import head_to_head, projections
 from app.models.league import League
 from app.models.team import Team
 from app.models.league_standings import LeagueStandings
+from app.models.standings_snapshot import StandingsSnapshot
 from app.schemas.league import (
-    LeagueCreate, LeagueUpdate, League as LeagueSchema,
-    TeamCreate, TeamUpdate, Team as TeamSchema,
+    LeagueCreate, LeagueUpdate, League as LeagueSchema, LeaguePage,
+    TeamCreate, TeamUpdate, Team as TeamSchema, TeamPage,
     LeagueStandingsCreate, LeagueStandingsUpdate, LeagueStandings as LeagueStandingsSchema,
-    LeagueStandingsWithTeam
+    LeagueStandingsWithTeam, HeadToHead, LeagueProjection,
+    StandingsSnapshotWithTeam, StandingsHistoryPoint
 )
 
 router = APIRouter()
@@ -22,18 +30,24 @@ router = APIRouter()
 def create_league(league: LeagueCreate, db: Session = Depends(get_db)):
     db_league = League(**league.dict())
     db.add(db_league)
+    invalidate_on_commit(db, "leagues")
     db.commit()
-    db.refresh(db_league)
     return db_league
 
 
-@router.get("/leagues/", response_model=List[LeagueSchema])
-def get_leagues(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.get("/leagues/", response_model=Union[List[LeagueSchema], LeaguePage])
+@cached(Union[List[LeagueSchema], LeaguePage], "leagues")
+def get_leagues(skip: int = 0, limit: int = 100, after: Optional[str] = None, db: Session = Depends(get_db)):
+    # Passing `after` (empty for the first page) switches to cursor pagination
+    if after is not None:
+        leagues, next_cursor = keyset_page(db.query(League), League.created_at, League.id, after, limit)
+        return {"items": leagues, "next_cursor": next_cursor}
     leagues = db.query(League).offset(skip).limit(limit).all()
     return leagues
 
 
 @router.get("/leagues/{league_id}", response_model=LeagueSchema)
+@cached(LeagueSchema, "league:{league_id}")
 def get_league(league_id: UUID, db: Session = Depends(get_db)):
     league = db.query(League).filter(League.id == league_id).first()
     if league is None:
@@ -51,17 +65,48 @@ def update_league(league_id: UUID, league: LeagueUpdate, db: Session = Depends(g
     for field, value in update_data.items():
         setattr(db_league, field, value)
     
+    # League names are embedded in match payloads
+    invalidate_on_commit(db, "leagues", f"league:{league_id}")
     db.commit()
-    db.refresh(db_league)
     return db_league
 
 
+@router.get("/leagues/{league_id}/head-to-head/{team_a_id}/{team_b_id}", response_model=HeadToHead)
+@cached(HeadToHead, "league:{league_id}")
+def get_head_to_head(league_id: UUID, team_a_id: UUID, team_b_id: UUID, db: Session = Depends(get_db)):
+    members = db.query(Team.id).filter(Team.league_id == league_id, Team.id.in_([team_a_id, team_b_id])).count()
+    if members != len({team_a_id, team_b_id}):
+        raise HTTPException(status_code=404, detail="Team not found in league")
+    # Teams that have not played yet are in the league but not in the matrix; pair() gives them zeros
+    matrix = head_to_head.get_matrix(db, league_id)
+    return {"league_id": league_id, "team_a_id": team_a_id, "team_b_id": team_b_id, **matrix.pair(team_a_id, team_b_id)}
+
+
+@router.get("/leagues/{league_id}/projections", response_model=LeagueProjection)
+@cached(LeagueProjection, "league:{league_id}")
+def get_league_projections(
+    league_id: UUID,
+    simulations: int = Query(
+        projections.PROJECTION_SIMULATIONS, ge=projections.SIMULATION_STEP, le=projections.PROJECTION_MAX_SIMULATIONS
+    ),
+    db: Session = Depends(get_db)
+):
+    league = db.query(League).filter(League.id == league_id).first()
+    if league is None:
+        raise HTTPException(status_code=404, detail="League not found")
+    return projections.project_league(db, league_id, simulations)
+
+
 @router.delete("/leagues/{league_id}")
 def delete_league(league_id: UUID, db: Session = Depends(get_db)):
     league = db.query(League).filter(League.id == league_id).first()
     if league is None:
         raise HTTPException(status_code=404, detail="League not found")
     
+    # Teams and matches go with the league
+    team_ids = [team_id for (team_id,) in db.query(Team.id).filter(Team.league_id == league_id)]
+    invalidate_on_commit(db, "leagues", f"league:{league_id}", "teams", "matches", *(f"team:{team_id}" for team_id in team_ids))
+    head_to_head.invalidate_on_commit(db, league_id)
     db.delete(league)
     db.commit()
     return {"message": "League deleted successfully"}
@@ -77,24 +122,32 @@ def create_team(team: TeamCreate, db: Session = Depends(get_db)):
     
     db_team = Team(**team.dict())
     db.add(db_team)
+    invalidate_on_commit(db, "teams", f"league:{db_team.league_id}")
+    head_to_head.invalidate_on_commit(db, db_team.league_id)
     db.commit()
-    db.refresh(db_team)
     return db_team
 
 
-@router.get("/teams/", response_model=List[TeamSchema])
-def get_teams(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.get("/teams/", response_model=Union[List[TeamSchema], TeamPage])
+@cached(Union[List[TeamSchema], TeamPage], "teams")
+def get_teams(skip: int = 0, limit: int = 100, after: Optional[str] = None, db: Session = Depends(get_db)):
+    # Passing `after` (empty for the first page) switches to cursor pagination
+    if after is not None:
+        teams, next_cursor = keyset_page(db.query(Team), Team.created_at, Team.id, after, limit)
+        return {"items": teams, "next_cursor": next_cursor}
     teams = db.query(Team).offset(skip).limit(limit).all()
     return teams
 
 
 @router.get("/teams/league/{league_id}", response_model=List[TeamSchema])
+@cached(List[TeamSchema], "league:{league_id}")
 def get_teams_by_league(league_id: UUID, db: Session = Depends(get_db)):
     teams = db.query(Team).filter(Team.league_id == league_id).all()
     return teams
 
 
 @router.get("/teams/{team_id}", response_model=TeamSchema)
+@cached(TeamSchema, "team:{team_id}")
 def get_team(team_id: UUID, db: Session = Depends(get_db)):
     team = db.query(Team).filter(Team.id == team_id).first()
     if team is None:
@@ -108,12 +161,15 @@ def update_team(team_id: UUID, team: TeamUpdate, db: Session = Depends(get_db)):
     if db_team is None:
         raise HTTPException(status_code=404, detail="Team not found")
     
+    previous_league_id = db_team.league_id
     update_data = team.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_team, field, value)
     
+    # Team names are embedded in standings and match payloads
+    invalidate_on_commit(db, "teams", f"team:{team_id}", f"league:{previous_league_id}", f"league:{db_team.league_id}")
+    head_to_head.invalidate_on_commit(db, previous_league_id, db_team.league_id)
     db.commit()
-    db.refresh(db_team)
     return db_team
 
 
@@ -123,6 +179,8 @@ def delete_team(team_id: UUID, db: Session = Depends(get_db)):
     if team is None:
         raise HTTPException(status_code=404, detail="Team not found")
     
+    invalidate_on_commit(db, "teams", f"team:{team_id}", f"league:{team.league_id}")
+    head_to_head.invalidate_on_commit(db, team.league_id)
     db.delete(team)
     db.commit()
     return {"message": "Team deleted successfully"}
@@ -142,20 +200,45 @@ def create_standings(standings: LeagueStandingsCreate, db: Session = Depends(get
     
     db_standings = LeagueStandings(**standings.dict())
     db.add(db_standings)
+    projections.invalidate_on_commit(db, db_standings.league_id)
+    invalidate_on_commit(db, "standings", f"league:{db_standings.league_id}")
     db.commit()
-    db.refresh(db_standings)
     return db_standings
 
 
 @router.get("/standings/league/{league_id}", response_model=List[LeagueStandingsWithTeam])
-def get_standings_by_league(league_id: UUID, db: Session = Depends(get_db)):
-    standings = db.query(LeagueStandings).filter(
+@cached(List[LeagueStandingsWithTeam], "league:{league_id}")
+def get_standings_by_league(league_id: UUID, as_of: Optional[date] = None, db: Session = Depends(get_db)):
+    # The table as it stood after the last matchday on or before `as_of`
+    if as_of is not None:
+        matchday = db.query(func.max(StandingsSnapshot.matchday)).filter(
+            StandingsSnapshot.league_id == league_id,
+            StandingsSnapshot.matchday <= as_of,
+        ).scalar()
+        if matchday is None:
+            return []
+        return load_for(db.query(StandingsSnapshot), StandingsSnapshotWithTeam).filter(
+            StandingsSnapshot.league_id == league_id,
+            StandingsSnapshot.matchday == matchday,
+        ).order_by(StandingsSnapshot.position.asc()).all()
+
+    standings = load_for(db.query(LeagueStandings), LeagueStandingsWithTeam).filter(
         LeagueStandings.league_id == league_id
-    ).join(Team).order_by(LeagueStandings.position.asc()).all()
+    ).order_by(LeagueStandings.position.asc()).all()
     return standings
 
 
+@router.get("/standings/league/{league_id}/history", response_model=List[StandingsHistoryPoint])
+@cached(List[StandingsHistoryPoint], "league:{league_id}")
+def get_standings_history(league_id: UUID, team_id: Optional[UUID] = None, db: Session = Depends(get_db)):
+    query = db.query(StandingsSnapshot).filter(StandingsSnapshot.league_id == league_id)
+    if team_id is not None:
+        query = query.filter(StandingsSnapshot.team_id == team_id)
+    return query.order_by(StandingsSnapshot.matchday.asc(), StandingsSnapshot.position.asc()).all()
+
+
 @router.get("/standings/{standings_id}", response_model=LeagueStandingsSchema)
+@conditional(LeagueStandingsSchema)
 def get_standings(standings_id: UUID, db: Session = Depends(get_db)):
     standings = db.query(LeagueStandings).filter(LeagueStandings.id == standings_id).first()
     if standings is None:
@@ -173,8 +256,9 @@ def update_standings(standings_id: UUID, standings: LeagueStandingsUpdate, db: S
     for field, value in update_data.items():
         setattr(db_standings, field, value)
     
+    projections.invalidate_on_commit(db, db_standings.league_id)
+    invalidate_on_commit(db, "standings", f"league:{db_standings.league_id}")
     db.commit()
-    db.refresh(db_standings)
     return db_standings
 
 
@@ -184,6 +268,8 @@ def delete_standings(standings_id: UUID, db: Session = Depends(get_db)):
     if standings is None:
         raise HTTPException(status_code=404, detail="Standings not found")
     
+    projections.invalidate_on_commit(db, standings.league_id)
+    invalidate_on_commit(db, "standings", f"league:{standings.league_id}")
     db.delete(standings)
     db.commit()
     return {"message": "Standings deleted successfully"}
@@ -1,74 +1,121 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
 from uuid import UUID
 from datetime import datetime
+from types import SimpleNamespace
 
+from app.core.cache import cached, invalidate_on_commit
 from app.db.session import get_db
+from app.db.loaders import load_fields, load_for
+from app.db.fieldsets import parse_fields, shape, shape_page
+from app.db.pagination import keyset_page
 from app.models.match_new import Match
+from app.services.standings_service import apply_match_change, match_result
+from app.services import club_timeline, projections
 from app.schemas.match import (
     MatchCreate, MatchUpdate, Match as MatchSchema,
-    MatchWithTeams, MatchWithTeamsAndLeague
+    MatchWithTeams, MatchWithTeamsAndLeague, MatchPage
 )
 
 router = APIRouter()
 
+# Match payloads embed team and league names, so every cached match response
+# also carries the "teams" and "leagues" tags that renames bump
+EMBEDDED = ("teams", "leagues")
+# Upcoming/recent move with the clock as well as with writes
+CLUB_FIXTURES_TTL = 60
+
+
+def club_tags(**_):
+    return [f"team:{team_id}" for team_id in club_timeline.CLUB_TEAM_IDS]
+
+
+def _invalidate_match(db: Session, *matches):
+    """Bump the tags of a match as it was before and after a write"""
+    # Match writes move the league tables too (apply_match_change)
+    tags = ["matches", "standings"]
+    for match in matches:
+        tags += [f"match:{match.id}", f"league:{match.league_id}", f"team:{match.home_team_id}", f"team:{match.away_team_id}"]
+    invalidate_on_commit(db, *tags)
+
 
 # Match endpoints
 @router.post("/matches/", response_model=MatchSchema)
 def create_match(match: MatchCreate, db: Session = Depends(get_db)):
     db_match = Match(**match.dict())
     db.add(db_match)
+    apply_match_change(db, None, match_result(db_match))
+    projections.invalidate_on_commit(db, db_match.league_id)
+    club_timeline.invalidate_on_commit(db, db_match.home_team_id, db_match.away_team_id)
+    _invalidate_match(db, db_match)
     db.commit()
-    db.refresh(db_match)
     return db_match
 
 
-@router.get("/matches/", response_model=List[MatchWithTeamsAndLeague])
-def get_matches(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    matches = db.query(Match).offset(skip).limit(limit).all()
-    return matches
+@router.get("/matches/", response_model=Union[List[MatchWithTeamsAndLeague], MatchPage])
+@cached(Union[List[MatchWithTeamsAndLeague], MatchPage], "matches", *EMBEDDED)
+def get_matches(
+    skip: int = 0, limit: int = 100, after: Optional[str] = None, fields: Optional[str] = None, db: Session = Depends(get_db)
+):
+    fieldset = parse_fields(fields, MatchWithTeamsAndLeague, Match)
+    query = load_fields(db.query(Match), MatchWithTeamsAndLeague, fieldset, Match.match_date)
+    # Passing `after` (empty for the first page) switches to cursor pagination
+    if after is not None:
+        matches, next_cursor = keyset_page(query, Match.match_date, Match.id, after, limit)
+        return shape_page(fieldset, matches, next_cursor)
+    matches = query.offset(skip).limit(limit).all()
+    return shape(fieldset, matches)
 
 
 @router.get("/matches/league/{league_id}", response_model=List[MatchWithTeamsAndLeague])
-def get_matches_by_league(league_id: UUID, db: Session = Depends(get_db)):
-    matches = db.query(Match).filter(Match.league_id == league_id).order_by(Match.match_date.asc()).all()
-    return matches
+@cached(List[MatchWithTeamsAndLeague], "league:{league_id}", *EMBEDDED)
+def get_matches_by_league(league_id: UUID, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    fieldset = parse_fields(fields, MatchWithTeamsAndLeague, Match)
+    matches = load_fields(db.query(Match), MatchWithTeamsAndLeague, fieldset).filter(Match.league_id == league_id).order_by(Match.match_date.asc()).all()
+    return shape(fieldset, matches)
 
 
 @router.get("/matches/team/{team_id}", response_model=List[MatchWithTeamsAndLeague])
-def get_matches_by_team(team_id: UUID, db: Session = Depends(get_db)):
-    matches = db.query(Match).filter(
+@cached(List[MatchWithTeamsAndLeague], "team:{team_id}", *EMBEDDED)
+def get_matches_by_team(team_id: UUID, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    fieldset = parse_fields(fields, MatchWithTeamsAndLeague, Match)
+    matches = load_fields(db.query(Match), MatchWithTeamsAndLeague, fieldset).filter(
         (Match.home_team_id == team_id) | (Match.away_team_id == team_id)
     ).order_by(Match.match_date.asc()).all()
-    return matches
+    return shape(fieldset, matches)
 
 
 @router.get("/matches/upcoming", response_model=List[MatchWithTeamsAndLeague])
-def get_upcoming_matches(limit: int = 10, db: Session = Depends(get_db)):
-    now = datetime.now()
-    matches = db.query(Match).filter(
-        (Match.home_team_id == "e58059d6-5b63-4f65-bb65-0c7e36ceb132") | (Match.away_team_id == "e58059d6-5b63-4f65-bb65-0c7e36ceb132"),
-        Match.match_date >= now,
-        Match.status == "SCHEDULED"
-    ).order_by(Match.match_date.asc()).limit(limit).all()
-    return matches
+@cached(List[MatchWithTeamsAndLeague], club_tags, *EMBEDDED, ttl=CLUB_FIXTURES_TTL)
+def get_upcoming_matches(limit: int = 10, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    fieldset = parse_fields(fields, MatchWithTeamsAndLeague, Match)
+    match_ids = club_timeline.get_timeline(db).upcoming(datetime.now(), limit)
+    if not match_ids:
+        return []
+    matches = load_fields(db.query(Match), MatchWithTeamsAndLeague, fieldset).filter(
+        Match.id.in_(match_ids)
+    ).order_by(Match.match_date.asc()).all()
+    return shape(fieldset, matches)
 
 
 @router.get("/matches/recent", response_model=List[MatchWithTeamsAndLeague])
-def get_recent_matches(limit: int = 10, db: Session = Depends(get_db)):
-    now = datetime.now()
-    matches = db.query(Match).filter(
-        (Match.home_team_id == "e58059d6-5b63-4f65-bb65-0c7e36ceb132") | (Match.away_team_id == "e58059d6-5b63-4f65-bb65-0c7e36ceb132"),
-        Match.match_date < now,
-        Match.status == "COMPLETED"
-    ).order_by(Match.match_date.desc()).limit(limit).all()
-    return matches
+@cached(List[MatchWithTeamsAndLeague], club_tags, *EMBEDDED, ttl=CLUB_FIXTURES_TTL)
+def get_recent_matches(limit: int = 10, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    fieldset = parse_fields(fields, MatchWithTeamsAndLeague, Match)
+    match_ids = club_timeline.get_timeline(db).recent(datetime.now(), limit)
+    if not match_ids:
+        return []
+    matches = load_fields(db.query(Match), MatchWithTeamsAndLeague, fieldset).filter(
+        Match.id.in_(match_ids)
+    ).order_by(Match.match_date.desc()).all()
+    return shape(fieldset, matches)
 
 
 @router.get("/matches/{match_id}", response_model=MatchWithTeamsAndLeague)
+@cached(MatchWithTeamsAndLeague, "match:{match_id}", *EMBEDDED)
 def get_match(match_id: UUID, db: Session = Depends(get_db)):
-    match = db.query(Match).filter(Match.id == match_id).first()
+    match = load_for(db.query(Match), MatchWithTeamsAndLeague).filter(Match.id == match_id).first()
     if match is None:
         raise HTTPException(status_code=404, detail="Match not found")
     return match
@@ -80,12 +127,22 @@ def update_match(match_id: UUID, match: MatchUpdate, db: Session = Depends(get_d
     if db_match is None:
         raise HTTPException(status_code=404, detail="Match not found")
     
+    before = match_result(db_match)
+    previous = SimpleNamespace(
+        id=db_match.id, league_id=db_match.league_id,
+        home_team_id=db_match.home_team_id, away_team_id=db_match.away_team_id
+    )
     update_data = match.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_match, field, value)
     
+    apply_match_change(db, before, match_result(db_match))
+    projections.invalidate_on_commit(db, previous.league_id, db_match.league_id)
+    club_timeline.invalidate_on_commit(
+        db, previous.home_team_id, previous.away_team_id, db_match.home_team_id, db_match.away_team_id
+    )
+    _invalidate_match(db, previous, db_match)
     db.commit()
-    db.refresh(db_match)
     return db_match
 
 
@@ -95,6 +152,12 @@ def delete_match(match_id: UUID, db: Session = Depends(get_db)):
     if match is None:
         raise HTTPException(status_code=404, detail="Match not found")
     
+    before = match_result(match)
     db.delete(match)
+    db.flush()
+    apply_match_change(db, before, None)
+    projections.invalidate_on_commit(db, match.league_id)
+    club_timeline.invalidate_on_commit(db, match.home_team_id, match.away_team_id)
+    _invalidate_match(db, match)
     db.commit()
     return {"message": "Match deleted successfully"}
@@ -5,6 +5,9 @@ from app.models.player import Player
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.db.deps import get_db
+from app.core.cache import cached, invalidate_on_commit
+from app.db.fieldsets import narrow, parse_fields, shape
+from typing import Optional
 
 router = APIRouter()
 
@@ -14,32 +17,38 @@ router = APIRouter()
 def create_player(player: PlayerCreate, db: Session = Depends(get_db)):
     db_player = Player(**player.dict())
     db.add(db_player)
+    invalidate_on_commit(db, "players")
     db.commit()
-    db.refresh(db_player)
     return db_player
 
 @router.get("/active-players", response_model=list[PlayerRead])
-def get__active_players(db: Session = Depends(get_db)):
-    return db.query(Player).filter(Player.status == 1).all()
+@cached(list[PlayerRead], "players")
+def get__active_players(fields: Optional[str] = None, db: Session = Depends(get_db)):
+    fieldset = parse_fields(fields, PlayerRead, Player)
+    return shape(fieldset, narrow(db.query(Player), fieldset).filter(Player.status == 1).all())
 
 @router.get("/roster", response_model=list[PlayerRead])
-def get_roster(db: Session = Depends(get_db)):
-    roster = db.query(Player).filter(Player.status == 1).order_by(Player.goals.desc(), Player.assists.desc()).all()
+@cached(list[PlayerRead], "players")
+def get_roster(fields: Optional[str] = None, db: Session = Depends(get_db)):
+    fieldset = parse_fields(fields, PlayerRead, Player)
+    roster = narrow(db.query(Player), fieldset).filter(Player.status == 1).order_by(Player.goals.desc(), Player.assists.desc()).all()
     #print(roster)
-    return roster
+    return shape(fieldset, roster)
 
 @router.delete("/{player_id}", response_model=PlayerRead)
 def delete_player(player_id: UUID, db: Session = Depends(get_db)):
     db_player = db.query(Player).filter(Player.id == player_id).first()
     if not db_player:
         raise HTTPException(status_code=404, detail="Player not found")
+    invalidate_on_commit(db, "players")
     db.delete(db_player)
     db.commit()
     return db_player
 
 
 @router.get("/requests", response_model=list[PlayerRead])
-def get_roster(db: Session = Depends(get_db)):
+@cached(list[PlayerRead], "players")
+def get_player_requests(db: Session = Depends(get_db)):
     return db.query(Player).filter(Player.status == 2).all()
 
 @router.put("/{player_id}/approve", response_model=PlayerRead)
@@ -49,8 +58,8 @@ def approve_player(player_id: UUID, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Player not found")
     db_player.status = 1
     db_player.joined_at = datetime.datetime.now()
+    invalidate_on_commit(db, "players")
     db.commit()
-    db.refresh(db_player)
     return db_player
 
 @router.delete("/{player_id}/reject", response_model=PlayerRead)
@@ -58,6 +67,7 @@ def reject_player(player_id: UUID, db: Session = Depends(get_db)):
     db_player = db.query(Player).filter(Player.id == player_id).first()
     if not db_player:
         raise HTTPException(status_code=404, detail="Player not found")
+    invalidate_on_commit(db, "players")
     db.delete(db_player)
     db.commit()
     return db_player
@@ -74,8 +84,8 @@ def edit_player(player_id: UUID, player_update: PlayerUpdate, db: Session = Depe
     for field, value in update_data.items():
         setattr(db_player, field, value)
     
+    invalidate_on_commit(db, "players")
     db.commit()
-    db.refresh(db_player)
     return db_player
 
 
@@ -0,0 +1,469 @@
+"""
+Response cache for the public read endpoints, invalidated by tags.
+
+A cached endpoint stores its serialized JSON body under a key made of the
+route and its query/path parameters. Each entry is tagged with the entities
+it was built from (`league:{id}`, `team:{id}`, `match:{id}`, `players`,
+`posts`, ...). Every tag has a version number. An entry records the versions
+of its tags when it is written and counts as stale once any of them moves
+on, so invalidating a tag is a single increment no matter how many entries
+carry it.
+
+Write handlers call `invalidate_on_commit(db, *tags)`, which bumps the tags
+once their transaction commits.
+
+Responses carry a strong ETag, the hash of the body. A request whose
+If-None-Match matches gets an empty 304. Cached endpoints answer it from the
+tag versions and the stored ETag alone, without a query. Cached bodies keep
+gzip/brotli copies beside them (app/core/compression.py). `conditional()`
+adds the same headers to an endpoint that is not cached.
+
+Read-your-writes holds through the cache too. A client that wrote within
+DB_REPLICA_STICKY_SECONDS skips the lookup and reads from the primary. A body
+rendered from a read replica within that window of a bump to one of its tags
+may predate the write, so it is returned but not stored.
+
+CACHE_BACKEND selects where entries live:
+- `memory` (default): a per-process LRU.
+- `redis`: shared between workers. Needs the `redis` package and CACHE_URL.
+- `off`: nothing is stored; responses still get ETags.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from enum import Enum
+from functools import wraps
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+
+from app.core.compression import COMPRESSION_ENABLED, COMPRESSION_MIN_SIZE, choose_encoding, compress, weak_etag
+from app.core.serialization import dump_json
+from app.db.session import DB_REPLICA_STICKY_SECONDS, after_commit
+
+try:
+    import redis
+except ImportError:  # only needed for CACHE_BACKEND=redis
+    redis = None
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_URL = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "2048"))
+CACHE_TTL = int(os.getenv("CACHE_TTL", "300"))
+CACHE_MAX_TAGS = int(os.getenv("CACHE_MAX_TAGS", str(8 * CACHE_MAX_ENTRIES)))
+
+
+class MemoryBackend:
+    """Least-recently-used entries with a per-entry expiry, local to this process"""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, max_tags: int = CACHE_MAX_TAGS):
+        self.max_entries = max_entries
+        self.max_tags = max_tags
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # Versions come from one counter, so no two bumps hand out the same number.
+        # A tag that was never bumped, or whose version was pruned, reads as
+        # `_floor`; pruning raises the floor above every version handed out so
+        # far, which makes entries that recorded a forgotten version stale
+        # rather than fresh.
+        self._versions: "OrderedDict[str, int]" = OrderedDict()
+        self._bumped_at: Dict[str, float] = {}
+        self._clock = 0
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def versions(self, tags: List[str]) -> List[int]:
+        with self._lock:
+            return [self._versions.get(tag, self._floor) for tag in tags]
+
+    def bump(self, tags: Iterable[str]):
+        with self._lock:
+            now = time.time()
+            for tag in tags:
+                self._clock += 1
+                self._versions[tag] = self._clock
+                self._versions.move_to_end(tag)
+                self._bumped_at[tag] = now
+            if len(self._versions) > self.max_tags:
+                self._prune_tags()
+
+    def _prune_tags(self):
+        """Forget the least recently bumped quarter of the tags, so the floor moves rarely"""
+        for _ in range(max(1, len(self._versions) - self.max_tags * 3 // 4)):
+            tag, _ = self._versions.popitem(last=False)
+            self._bumped_at.pop(tag, None)
+        self._clock += 1
+        self._floor = self._clock
+
+    def bumped_within(self, tags: List[str], seconds: float) -> bool:
+        since = time.time() - seconds
+        with self._lock:
+            return any(self._bumped_at.get(tag, 0) > since for tag in tags)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._bumped_at.clear()
+            self._clock += 1
+            self._floor = self._clock
+
+
+class RedisBackend:
+    """
+    Entries and tag versions in Redis, shared by every worker.
+
+    Takes any client with the redis-py get/set/mget/incr/pipeline interface,
+    so a local stand-in such as fakeredis works in place of a server.
+    """
+
+    def __init__(self, client, prefix: str = "disston:cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the redis package")
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: int):
+        self.client.set(self.prefix + key, value, ex=ttl)
+
+    def versions(self, tags: List[str]) -> List[int]:
+        if not tags:
+            return []
+        return [int(version or 0) for version in self.client.mget([self.prefix + "tag:" + tag for tag in tags])]
+
+    def bump(self, tags: Iterable[str]):
+        now = time.time()
+        pipe = self.client.pipeline()
+        for tag in tags:
+            pipe.incr(self.prefix + "tag:" + tag)
+            pipe.set(self.prefix + "bumped:" + tag, now, ex=3600)
+        pipe.execute()
+
+    def bumped_within(self, tags: List[str], seconds: float) -> bool:
+        if not tags:
+            return False
+        since = time.time() - seconds
+        stamps = self.client.mget([self.prefix + "bumped:" + tag for tag in tags])
+        return any(stamp is not None and float(stamp) > since for stamp in stamps)
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + "*"):
+            self.client.delete(key)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+_stats_lock = threading.Lock()
+# Key prefixes of the decorated endpoints, which must not share a namespace
+_prefixes = set()
+
+
+def get_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None and CACHE_BACKEND != "off":
+            _backend = RedisBackend.from_url(CACHE_URL) if CACHE_BACKEND == "redis" else MemoryBackend()
+        return _backend
+
+
+def set_backend(backend):
+    """Swap the cache backend (None turns caching off)"""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+def _count(name: str, n: int = 1):
+    with _stats_lock:
+        _stats[name] += n
+
+
+def stats() -> dict:
+    with _stats_lock:
+        return dict(_stats)
+
+
+def invalidate(*tags: str):
+    backend = get_backend()
+    tags = sorted(set(tags))
+    if backend is not None and tags:
+        backend.bump(tags)
+        _count("invalidations", len(tags))
+
+
+def invalidate_on_commit(db: Session, *tags: Optional[str]):
+    """Bump these tags once the current transaction commits; None entries are skipped"""
+    tags = {tag for tag in tags if tag is not None}
+    if tags:
+        after_commit(db, lambda: invalidate(*tags))
+
+
+def _recent_writer(db) -> bool:
+    """Whether get_db sent this GET to the primary because the client just wrote"""
+    return isinstance(db, Session) and db.info.get("recent_writer", False)
+
+
+def _key_value(value):
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (UUID, date, datetime)):
+        return str(value)
+    return None
+
+
+def _encode(header: dict, body: bytes) -> bytes:
+    return json.dumps(header).encode() + b"\n" + body
+
+
+def _decode(entry: bytes):
+    header, body = entry.split(b"\n", 1)
+    return json.loads(header), body
+
+
+def _etag(body: bytes) -> str:
+    """Strong validator for a response body"""
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def _not_modified(request: Optional[Request], etag: str) -> bool:
+    header = request.headers.get("if-none-match") if request is not None else None
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/"x" matches "x"
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+def _respond(
+    request: Optional[Request], body: bytes, etag: str, cache_status: Optional[str] = None, encode=None
+) -> Response:
+    """
+    A 304 when the request already has this body, else the body. `encode(encoding)`
+    may supply a compressed copy; without it CompressionMiddleware compresses.
+
+    The encoding is chosen before the 304 check, so a 304 carries the same ETag
+    (weak when the 200 would be compressed) and Vary as the 200 it stands for.
+    """
+    headers = {"ETag": etag}
+    if cache_status is not None:
+        headers["X-Cache"] = cache_status
+    encoding = choose_encoding(request.headers.get("accept-encoding", "")) if request is not None else None
+    if encoding is not None and len(body) < COMPRESSION_MIN_SIZE:
+        encoding = None
+    if encoding is not None:
+        headers["ETag"] = weak_etag(etag)
+    if _not_modified(request, etag):
+        if COMPRESSION_ENABLED:
+            # The 200 varies on Accept-Encoding (the middleware adds it to every JSON response)
+            headers["Vary"] = "Accept-Encoding"
+        return Response(status_code=304, headers=headers)
+    if encoding is not None and encode is not None:
+        body = encode(encoding)
+        headers.update({"Content-Encoding": encoding, "Vary": "Accept-Encoding"})
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _encoded_copy(backend, key: str, header: dict, body: bytes, encoding: str) -> bytes:
+    """
+    Return the body compressed with `encoding`, compressing at most once per
+    entry and encoding. The copy is stored under its own key with the entry's
+    header, so it goes stale and expires together with the entry.
+    """
+    copy_key = f"{key}|{encoding}"
+    entry = backend.get(copy_key)
+    if entry is not None:
+        copy_header, compressed = _decode(entry)
+        if copy_header == header:
+            return compressed
+    compressed = compress(body, encoding)
+    remaining = int(header["expires"] - time.time())
+    if remaining > 0:
+        backend.set(copy_key, _encode(header, compressed), remaining)
+    return compressed
+
+
+# Added to a decorated endpoint's signature so FastAPI passes the request in
+REQUEST_PARAM = "_conditional_request"
+
+
+def _accept_request(wrapper, func):
+    signature = inspect.signature(func)
+    request_param = inspect.Parameter(REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+    wrapper.__signature__ = signature.replace(parameters=[*signature.parameters.values(), request_param])
+    return wrapper
+
+
+def conditional(response_model):
+    """
+    Give a GET endpoint that is not cached an ETag and If-None-Match support.
+
+    The result is serialized through `response_model` and hashed, so a
+    matching request still runs the query but gets an empty 304 back.
+    """
+    def decorator(func):
+        def respond(request, result):
+            if request is None or isinstance(result, Response):
+                return result
+            body = dump_json(response_model, result)
+            return _respond(request, body, _etag(body))
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(**kwargs):
+                request = kwargs.pop(REQUEST_PARAM, None)
+                return respond(request, await func(**kwargs))
+
+            return _accept_request(async_wrapper, func)
+
+        @wraps(func)
+        def wrapper(**kwargs):
+            request = kwargs.pop(REQUEST_PARAM, None)
+            return respond(request, func(**kwargs))
+
+        return _accept_request(wrapper, func)
+
+    return decorator
+
+
+def cached(response_model, *tags, ttl: Optional[int] = None):
+    """
+    Cache a GET endpoint's JSON body.
+
+    `response_model` is the same type given to the route decorator; the result
+    is serialized through it (app.core.serialization) before it is stored.
+    Tags are format strings filled from the endpoint's arguments
+    (`"league:{league_id}"`) or callables that take those arguments and return
+    a list of tags. Only parameters with plain values (str, int, UUID, date,
+    ...) take part in the key, so the `db` session and other dependencies are
+    ignored.
+
+    Responses carry a strong ETag, the hash of the body. It is stored with the
+    entry, so a request whose If-None-Match matches a fresh entry gets a 304
+    without touching the database or serializing anything. Compressed copies
+    of the body are kept next to the entry (see _encoded_copy).
+    """
+    ttl = ttl or CACHE_TTL
+
+    def decorator(func):
+        prefix = f"{func.__module__}.{func.__qualname__}"
+        if prefix in _prefixes:
+            # Two endpoints under one prefix would serve each other's bodies whenever their parameters match
+            raise ValueError(f"{prefix} is already cached; give the endpoint a unique name")
+        _prefixes.add(prefix)
+
+        def lookup(kwargs):
+            """Return (backend, key, versions, tags, hit); hit is (header, body) for a fresh entry"""
+            backend = get_backend()
+            if backend is None:
+                return None, None, None, None, None
+
+            params = sorted(
+                (name, _key_value(value))
+                for name, value in kwargs.items()
+                if _key_value(value) is not None or value is None
+            )
+            key = prefix + ":" + hashlib.sha1(json.dumps(params).encode()).hexdigest()
+            entry_tags: List[str] = []
+            for tag in tags:
+                entry_tags.extend(tag(**kwargs) if callable(tag) else [tag.format(**kwargs)])
+
+            versions = backend.versions(entry_tags)
+            # The entry may have been rendered from a replica without this client's write
+            entry = backend.get(key) if not _recent_writer(kwargs.get("db")) else None
+            if entry is not None:
+                header, body = _decode(entry)
+                if isinstance(header, dict) and header.get("versions") == versions:
+                    _count("hits")
+                    return backend, key, versions, entry_tags, (header, body)
+            _count("misses")
+            return backend, key, versions, entry_tags, None
+
+        def store(backend, key, versions, entry_tags, db, result):
+            """Return (header, body); header is None when the body must not be cached"""
+            body = dump_json(response_model, result)
+            if isinstance(db, Session) and db.info.get("replica") is not None \
+                    and backend.bumped_within(entry_tags, DB_REPLICA_STICKY_SECONDS):
+                # The replica may not have the write behind that bump yet, and the writer must not be served this
+                return None, body
+            # Versions were read before the query, so a write that lands meanwhile leaves this entry stale
+            header = {"versions": versions, "etag": _etag(body), "expires": time.time() + ttl}
+            backend.set(key, _encode(header, body), ttl)
+            return header, body
+
+        def serve(request, backend, key, header, body, cache_status):
+            return _respond(
+                request, body, header["etag"], cache_status,
+                encode=lambda encoding: _encoded_copy(backend, key, header, body, encoding),
+            )
+
+        def respond(request, backend, key, versions, entry_tags, kwargs, result):
+            if backend is None:
+                # Called directly rather than through the router: hand back the plain result
+                if request is None:
+                    return result
+                body = dump_json(response_model, result)
+                return _respond(request, body, _etag(body))
+            header, body = store(backend, key, versions, entry_tags, kwargs.get("db"), result)
+            if header is None:
+                return _respond(request, body, _etag(body), "MISS")
+            return serve(request, backend, key, header, body, "MISS")
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(**kwargs):
+                request = kwargs.pop(REQUEST_PARAM, None)
+                backend, key, versions, entry_tags, hit = lookup(kwargs)
+                if hit is not None:
+                    return serve(request, backend, key, *hit, "HIT")
+                return respond(request, backend, key, versions, entry_tags, kwargs, await func(**kwargs))
+
+            return _accept_request(async_wrapper, func)
+
+        @wraps(func)
+        def wrapper(**kwargs):
+            request = kwargs.pop(REQUEST_PARAM, None)
+            backend, key, versions, entry_tags, hit = lookup(kwargs)
+            if hit is not None:
+                return serve(request, backend, key, *hit, "HIT")
+            return respond(request, backend, key, versions, entry_tags, kwargs, func(**kwargs))
+
+        return _accept_request(wrapper, func)
+
+    return decorator
@@ -0,0 +1,126 @@
+"""
+gzip/brotli response compression.
+
+CompressionMiddleware compresses a response body when:
+- the client accepts gzip or br,
+- the content type is in COMPRESSION_TYPES,
+- the body is at least COMPRESSION_MIN_SIZE bytes,
+- and the body is not already encoded.
+
+brotli is preferred when the `brotli` package is installed and the client
+accepts it. A compressed response's ETag becomes weak (W/"...") because the
+bytes no longer match the strong validator, and If-None-Match compares weakly.
+
+The response cache (app/core/cache.py) stores a compressed copy next to each
+entry and sends it pre-encoded. The middleware passes such responses through,
+so a hot payload is compressed once per encoding, not on every request.
+"""
+
+import gzip
+import os
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only without it
+    brotli = None
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_TYPES = [
+    content_type.strip()
+    for content_type in os.getenv(
+        "COMPRESSION_TYPES", "application/json,text/html,text/plain,text/css,application/javascript"
+    ).split(",")
+    if content_type.strip()
+]
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """The encoding to use for a request's Accept-Encoding header, or None to send it as is"""
+    if not COMPRESSION_ENABLED or not accept_encoding:
+        return None
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    if brotli is not None and accepted.get("br", wildcard) > 0:
+        return "br"
+    if accepted.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+def compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.split(";")[0].strip().lower() in COMPRESSION_TYPES
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output identical for identical input
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def weak_etag(etag: str) -> str:
+    return etag if etag.startswith("W/") else "W/" + etag
+
+
+class CompressionMiddleware:
+    """ASGI middleware that compresses single-message responses"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            if not compressible(headers.get("content-type")) or "content-encoding" in headers:
+                await send(start)
+                await send(message)
+                return
+            # Every representation of a compressible type varies, including the uncompressed one
+            headers.add_vary_header("Accept-Encoding")
+            # Streamed bodies and small ones go out as they are
+            if encoding is None or message.get("more_body") or len(body) < COMPRESSION_MIN_SIZE:
+                await send(start)
+                await send(message)
+                return
+
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            if "etag" in headers:
+                headers["ETag"] = weak_etag(headers["etag"])
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,182 @@
+"""
+Per-route SQL instrumentation and a slow-query log.
+
+Cursor events on every engine time each statement. PerfMiddleware gives each
+request a RequestStats through a context variable. The statements it runs
+(including those from the threadpool and the async engine) are counted there.
+When the request ends, its numbers are added to a rolling window for its
+route template (`GET /api/matches/{match_id}`). route_stats() summarizes the
+windows for /api/admin/perf.
+
+A statement slower than SLOW_QUERY_MS is logged to the `app.slow_queries`
+logger with its bound parameters. With SLOW_QUERY_EXPLAIN on, its query plan
+is logged too. SLOW_QUERY_LOG_FILE also writes that log to a file.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+PERF_ENABLED = os.getenv("PERF_ENABLED", "true").lower() == "true"
+# Requests kept per route for the rolling aggregates
+PERF_WINDOW = int(os.getenv("PERF_WINDOW", "500"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "false").lower() == "true"
+SLOW_QUERY_LOG_FILE = os.getenv("SLOW_QUERY_LOG_FILE")
+
+slow_query_log = logging.getLogger("app.slow_queries")
+if SLOW_QUERY_LOG_FILE:
+    _handler = logging.FileHandler(SLOW_QUERY_LOG_FILE)
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    slow_query_log.addHandler(_handler)
+    slow_query_log.setLevel(logging.INFO)
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.slowest: Optional[str] = None
+        self.slowest_time = 0.0
+        # Endpoints that fan out record from several threads at once
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed: float):
+        with self._lock:
+            self._record(statement, elapsed)
+
+    def _record(self, statement: str, elapsed: float):
+        self.queries += 1
+        self.db_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest, self.slowest_time = statement, elapsed
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("perf_request_stats", default=None)
+
+
+class RouteStats:
+    def __init__(self):
+        self.requests = 0
+        # (queries, db seconds, request seconds, slowest statement, its seconds)
+        self.recent = deque(maxlen=PERF_WINDOW)
+
+    def add(self, stats: RequestStats, duration: float):
+        self.requests += 1
+        self.recent.append((stats.queries, stats.db_time, duration, stats.slowest, stats.slowest_time))
+
+    def snapshot(self) -> dict:
+        recent = list(self.recent)
+        queries = sorted(sample[0] for sample in recent)
+        db_times = sorted(sample[1] for sample in recent)
+        durations = sorted(sample[2] for sample in recent)
+        slowest = max(recent, key=lambda sample: sample[4])
+
+        def summary(values, scale=1):
+            return {
+                "avg": round(sum(values) / len(values) * scale, 3),
+                "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))] * scale, 3),
+                "max": round(values[-1] * scale, 3),
+            }
+
+        return {
+            "requests": self.requests,
+            "window": len(recent),
+            "queries": summary(queries),
+            "db_ms": summary(db_times, 1000),
+            "duration_ms": summary(durations, 1000),
+            "slowest_statement": {"sql": slowest[3], "ms": round(slowest[4] * 1000, 3)} if slowest[3] else None,
+        }
+
+
+_routes: Dict[str, RouteStats] = {}
+_routes_lock = threading.Lock()
+
+
+def route_stats() -> dict:
+    with _routes_lock:
+        routes = {name: stats for name, stats in _routes.items() if stats.recent}
+        snapshots = {name: stats.snapshot() for name, stats in routes.items()}
+    # Most database time first
+    return dict(sorted(snapshots.items(), key=lambda item: -item[1]["db_ms"]["avg"] * item[1]["window"]))
+
+
+def _record_request(route: str, stats: RequestStats, duration: float):
+    with _routes_lock:
+        entry = _routes.get(route)
+        if entry is None:
+            entry = _routes[route] = RouteStats()
+        entry.add(stats, duration)
+
+
+class PerfMiddleware:
+    """ASGI middleware that attributes each request's SQL to its route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not PERF_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            # Unmatched paths are pooled so scanners cannot grow the table
+            template = getattr(route, "path", None) or "<unmatched>"
+            _record_request(f"{scope['method']} {template}", stats, time.perf_counter() - start)
+
+
+def _explain(conn, statement, parameters) -> Optional[str]:
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    conn.info["perf_explaining"] = True
+    try:
+        rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+    except Exception as exc:  # the plan is best effort; never fail the request over it
+        return f"EXPLAIN failed: {exc}"
+    finally:
+        conn.info["perf_explaining"] = False
+    return "\n".join(" ".join(str(column) for column in row) for row in rows)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("perf_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # after_cursor_execute does not run for a failed statement
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("perf_started"):
+        conn.info["perf_started"].pop()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["perf_started"].pop()
+    if conn.info.get("perf_explaining"):
+        return
+
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        message = f"slow query ({elapsed * 1000:.1f} ms): {statement} | parameters: {parameters!r:.1000}"
+        if SLOW_QUERY_EXPLAIN and not executemany and statement.lstrip().upper().startswith("SELECT"):
+            message += "\n" + (_explain(conn, statement, parameters) or "")
+        slow_query_log.warning(message)
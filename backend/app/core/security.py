@@ -3,7 +3,17 @@ from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from typing import Optional
 from dotenv import load_dotenv
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+import asyncio
+import hashlib
+import multiprocessing
+import threading
+import time
 import os
+import uuid
 
 
 load_dotenv()
@@ -16,6 +26,63 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+# bcrypt runs in its own process pool so a burst of logins cannot hold the
+# GIL and the request threadpool. At most PASSWORD_HASH_MAX_PENDING hashes
+# are queued or running; callers beyond that get a 503 straight away.
+# PASSWORD_HASH_WORKERS=0 hashes in the request threadpool instead.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(max(1, PASSWORD_HASH_WORKERS) * 8)))
+
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+# Only touched from the event loop, so no lock is needed around it
+_pending_hashes = 0
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            # Spawned rather than forked: the server process has threads (and
+            # its listening socket) that forked workers would inherit
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _hash_pool
+
+
+def shutdown_hash_pool():
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(wait=True, cancel_futures=True)
+            _hash_pool = None
+
+
+async def _run_hash(func, *args):
+    global _pending_hashes
+    if _pending_hashes >= PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in requests, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    _pending_hashes += 1
+    try:
+        if PASSWORD_HASH_WORKERS <= 0:
+            return await run_in_threadpool(func, *args)
+        return await asyncio.get_running_loop().run_in_executor(_get_hash_pool(), func, *args)
+    finally:
+        _pending_hashes -= 1
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hash(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hash(verify_password, plain_password, hashed_password)
+
 # JWT config
 SECRET_KEY = os.getenv("SECRET_KEY")  # should come from .env in prod
 ALGORITHM = os.getenv("ALGORITHM")
@@ -27,8 +94,59 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+
+def create_refresh_token(user_id: str) -> str:
+    """Long-lived token that can only be exchanged at /auth/refresh; `jti` identifies it for revocation"""
+    expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    to_encode = {"sub": user_id, "type": "refresh", "jti": uuid.uuid4().hex, "exp": expire}
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+# Claims of tokens whose signature was already checked, keyed by the token's
+# SHA-256 digest; an entry is only served until the token's `exp`
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "4096"))
+
+_verified_tokens: "OrderedDict[bytes, tuple]" = OrderedDict()
+_verified_tokens_lock = threading.Lock()
+
+
+def _cached_claims(digest: bytes) -> Optional[dict]:
+    with _verified_tokens_lock:
+        item = _verified_tokens.get(digest)
+        if item is None:
+            return None
+        expires_at, claims = item
+        if expires_at <= time.time():
+            del _verified_tokens[digest]
+            return None
+        _verified_tokens.move_to_end(digest)
+        return dict(claims)
+
+
+def _remember_claims(digest: bytes, claims: dict):
+    expires_at = claims.get("exp")
+    if not isinstance(expires_at, (int, float)):
+        return
+    with _verified_tokens_lock:
+        _verified_tokens[digest] = (expires_at, dict(claims))
+        _verified_tokens.move_to_end(digest)
+        while len(_verified_tokens) > TOKEN_CACHE_MAX_ENTRIES:
+            _verified_tokens.popitem(last=False)
+
+
+def clear_token_cache():
+    with _verified_tokens_lock:
+        _verified_tokens.clear()
+
+
 def decode_access_token(token: str) -> Optional[dict]:
+    digest = hashlib.sha256(token.encode()).digest()
+    claims = _cached_claims(digest)
+    if claims is not None:
+        return claims
     try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+    _remember_claims(digest, claims)
+    return dict(claims)
\ No newline at end of file
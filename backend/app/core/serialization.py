@@ -0,0 +1,47 @@
+"""
+Serialization straight from ORM objects to JSON bytes.
+
+A route declared with `response_model=List[Schema]` that returns ORM rows
+has FastAPI validate each row into the schema, convert the result back into
+Python dicts and lists, and then encode those with the standard json module.
+dump_json() instead validates once (from attributes) and lets pydantic-core
+write the bytes directly. TypeAdapters are built once per schema and shared
+by every route that returns it.
+
+The response cache and `conditional()` (app/core/cache.py) serialize through
+this module. A route with neither can return `json_response(Schema, result)`.
+A route whose output schema depends on the request (sparse fieldsets, see
+app/db/fieldsets.py) returns `Shaped(schema, result)`, which is serialized
+through its own schema instead of the route's. Those schemas are built per
+request shape, so they bring their own TypeAdapter rather than one from the
+shared cache, which would keep every rebuilt schema alive.
+"""
+
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def adapter_for(schema) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+class Shaped(NamedTuple):
+    """A result to serialize through `schema` (a type or a TypeAdapter) rather than the schema it is dumped with"""
+    schema: Any
+    value: Any
+
+
+def dump_json(schema, value: Any) -> bytes:
+    """Validate `value` (ORM objects, dicts or models) against `schema` and encode it as FastAPI would"""
+    if isinstance(value, Shaped):
+        schema, value = value
+    adapter = schema if isinstance(schema, TypeAdapter) else adapter_for(schema)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True), by_alias=True)
+
+
+def json_response(schema, value: Any, headers: dict = None) -> Response:
+    return Response(content=dump_json(schema, value), media_type="application/json", headers=headers)
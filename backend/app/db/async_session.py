@@ -0,0 +1,83 @@
+"""
+Async engine and session for the async read routes (app/api/routes/async_read.py).
+
+The async URL is derived from SB_DB_URL (postgresql -> postgresql+asyncpg,
+sqlite -> sqlite+aiosqlite) unless SB_DB_ASYNC_URL is set. Pool settings
+and the SQLite profile are shared with the sync engine. The engine is only
+created when DB_ASYNC_ROUTES is on, so the asyncpg/aiosqlite drivers are
+needed only then.
+"""
+
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db.session import (
+    DATABASE_URL, DB_MAX_OVERFLOW, DB_POOL_MODE, DB_POOL_PRE_PING, DB_POOL_RECYCLE, DB_POOL_SIZE, DB_POOL_TIMEOUT,
+    apply_sqlite_profile,
+)
+
+load_dotenv()
+
+DB_ASYNC_ROUTES = os.getenv("DB_ASYNC_ROUTES", "false").lower() == "true"
+
+ASYNC_DRIVERS = {
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_url(url: str) -> str:
+    url = make_url(url)
+    drivername = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    query = dict(url.query)
+    # asyncpg spells libpq's sslmode as ssl
+    if drivername == "postgresql+asyncpg" and "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return url.set(drivername=drivername, query=query).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.getenv("SB_DB_ASYNC_URL") or async_url(DATABASE_URL)
+
+_async_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        options = {"pool_pre_ping": DB_POOL_PRE_PING}
+        if DB_POOL_MODE == "transaction":
+            options["poolclass"] = NullPool
+            if ASYNC_DATABASE_URL.startswith("postgresql+asyncpg"):
+                # Prepared statements do not survive PgBouncer's transaction pooling
+                options["connect_args"] = {"statement_cache_size": 0}
+        else:
+            options.update(
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_timeout=DB_POOL_TIMEOUT,
+                pool_recycle=DB_POOL_RECYCLE,
+            )
+        _async_engine = create_async_engine(ASYNC_DATABASE_URL, **options)
+        apply_sqlite_profile(_async_engine.sync_engine)
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+
+async def get_async_db():
+    """Dependency to get an async database session"""
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    if _async_engine is not None:
+        await _async_engine.dispose()
@@ -1,8 +1 @@
-from app.db.session import SessionLocal
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+from app.db.session import get_db  # noqa: F401
@@ -0,0 +1,177 @@
+"""
+Sparse fieldsets: the `fields` query parameter of the list routes.
+
+`fields` is a comma-separated list of field names from the route's response
+schema, e.g. `?fields=match_date,home_score,away_score,home_team.name`. A
+relationship is narrowed with a dot, or named on its own to get the whole
+nested object. The primary key is always returned.
+
+parse_fields() checks the names against the schema and returns a Fieldset,
+which narrows both ends of the request:
+- the query loads only those columns (load_only) and joins only those
+  relationships, each narrowed the same way;
+- the response goes through a pydantic model that has only those fields.
+
+Models, their TypeAdapters and loader options are built once per distinct
+fieldset and kept in bounded LRUs, so a client cycling through `fields`
+combinations evicts old ones rather than growing memory. Routes pass
+the fieldset to narrow() (or app.db.loaders.load_fields() in place of
+load_for()) and wrap their result in shape() / shape_page(), which hands it
+to the serializer with the narrowed schema. Without `fields` these fall back
+to the full response.
+"""
+
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple, Union, get_args, get_origin
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import joinedload, load_only, selectinload
+
+from app.core.serialization import Shaped
+
+
+def _nested_model(annotation):
+    """The pydantic model inside `Team`, `Optional[Team]` or `List[Team]`, if any"""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in get_args(annotation):
+        model = _nested_model(arg)
+        if model is not None:
+            return model
+    return None
+
+
+def _replace_model(annotation, old, new):
+    if annotation is old:
+        return new
+    args = get_args(annotation)
+    if not args:
+        return annotation
+    args = tuple(_replace_model(arg, old, new) for arg in args)
+    origin = get_origin(annotation)
+    if origin in (list, List):
+        return List[args[0]]
+    return Union[args]
+
+
+def _narrow(schema, names, nested) -> type:
+    """A copy of `schema` with only `names`; `nested` maps relationship fields to their own names (or None)"""
+    definitions = {}
+    for name, field in schema.model_fields.items():
+        if name not in names:
+            continue
+        annotation = field.annotation
+        if nested.get(name):
+            inner = _nested_model(annotation)
+            annotation = _replace_model(annotation, inner, _narrow(inner, nested[name], {}))
+        definitions[name] = (annotation, field)
+    return create_model(f"{schema.__name__}Fields", __config__=ConfigDict(from_attributes=True), **definitions)
+
+
+def _loader_options(model, names, nested, extra) -> list:
+    mapper = sa_inspect(model)
+    columns = [getattr(model, name) for name in sorted(names | set(extra)) if name in mapper.column_attrs]
+    options = []
+    # Fields that are neither columns nor relationships may read any column, so nothing is deferred then
+    if columns and all(name in mapper.column_attrs or name in mapper.relationships for name in names):
+        options.append(load_only(*columns))
+    for name in names:
+        if name not in mapper.relationships:
+            continue
+        relationship = mapper.relationships[name]
+        loader = (selectinload if relationship.uselist else joinedload)(getattr(model, name))
+        target = relationship.mapper
+        if nested.get(name) and all(sub in target.column_attrs for sub in nested[name]):
+            loader = loader.load_only(*(getattr(target.class_, sub) for sub in nested[name]))
+        options.append(loader)
+    return options
+
+
+def _split(spec):
+    return {name for name, _ in spec}, {name: set(subfields) for name, subfields in spec if subfields}
+
+
+class _Narrowed(NamedTuple):
+    schema: type
+    # Serializers for a list of `schema` and for a keyset page of them
+    items: TypeAdapter
+    page: TypeAdapter
+
+
+@lru_cache(maxsize=256)
+def _narrowed(schema, spec: Tuple[Tuple[str, Optional[Tuple[str, ...]]], ...]) -> _Narrowed:
+    narrowed = _narrow(schema, *_split(spec))
+    page = create_model(
+        f"{narrowed.__name__}Page",
+        items=(List[narrowed], ...),
+        next_cursor=(Optional[str], None),
+    )
+    return _Narrowed(narrowed, TypeAdapter(List[narrowed]), TypeAdapter(page))
+
+
+@lru_cache(maxsize=256)
+def _options(model, spec, extra: Tuple[str, ...]) -> list:
+    return _loader_options(model, *_split(spec), extra)
+
+
+class Fieldset:
+    def __init__(self, schema, model, spec):
+        self.narrowed = _narrowed(schema, spec)
+        self.model = model
+        self.spec = spec
+
+    def apply(self, query, *columns):
+        """Narrow a Query or select(); `columns` are loaded too (e.g. a pagination sort key) but not returned"""
+        return query.options(*_options(self.model, self.spec, tuple(column.key for column in columns)))
+
+
+def parse_fields(fields: Optional[str], schema, model) -> Optional[Fieldset]:
+    """The Fieldset for a `fields` parameter, or None to return everything"""
+    if not fields or not fields.strip():
+        return None
+    spec = {}
+    for item in fields.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, subfield = item.partition(".")
+        field = schema.model_fields.get(name)
+        if field is None:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {item}")
+        if not subfield:
+            # A bare relationship name asks for the whole nested object
+            spec[name] = None
+            continue
+        inner = _nested_model(field.annotation)
+        if inner is None or "." in subfield or subfield not in inner.model_fields:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {item}")
+        if spec.get(name, set()) is not None:
+            spec.setdefault(name, set()).add(subfield)
+    if "id" in schema.model_fields:
+        spec.setdefault("id", None)
+    key = tuple(sorted((name, tuple(sorted(subfields)) if subfields else None) for name, subfields in spec.items()))
+    return Fieldset(schema, model, key)
+
+
+def narrow(query, fieldset: Optional[Fieldset], *columns):
+    """Apply the fieldset's loader options, if there is a fieldset"""
+    if fieldset is None:
+        return query
+    return fieldset.apply(query, *columns)
+
+
+def shape(fieldset: Optional[Fieldset], rows):
+    """A list result, serialized through the narrowed schema when there is one"""
+    if fieldset is None:
+        return rows
+    return Shaped(fieldset.narrowed.items, rows)
+
+
+def shape_page(fieldset: Optional[Fieldset], items, next_cursor: Optional[str]):
+    """A keyset page (`{"items", "next_cursor"}`), narrowed like shape()"""
+    page = {"items": items, "next_cursor": next_cursor}
+    if fieldset is None:
+        return page
+    return Shaped(fieldset.narrowed.page, page)
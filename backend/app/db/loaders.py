@@ -0,0 +1,65 @@
+"""
+Relationship loading profiles, keyed by the response schema they feed.
+
+Pydantic walks the nested attributes of a response model after the route
+returns, so any relationship the schema touches must already be loaded or it
+triggers one lazy SELECT per row. Routes pick the profile that matches their
+response_model instead of building options by hand.
+"""
+
+from typing import Optional
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.db.fieldsets import Fieldset, narrow
+from app.models.league import League
+from app.models.league_standings import LeagueStandings
+from app.models.match_new import Match
+from app.models.standings_snapshot import StandingsSnapshot
+from app.models.team import Team
+from app.schemas.league import LeagueStandingsWithTeam, LeagueWithTeams, StandingsSnapshotWithTeam, TeamWithStandings
+from app.schemas.match import MatchWithTeams, MatchWithTeamsAndLeague
+
+
+# Many-to-one relationships are joined into the same SELECT; collections are
+# fetched with one extra IN query per relationship so the row count stays flat.
+LOADER_PROFILES = {
+    MatchWithTeams: (
+        joinedload(Match.home_team),
+        joinedload(Match.away_team),
+        joinedload(Match.league),
+    ),
+    MatchWithTeamsAndLeague: (
+        joinedload(Match.home_team),
+        joinedload(Match.away_team),
+        joinedload(Match.league),
+    ),
+    LeagueStandingsWithTeam: (
+        joinedload(LeagueStandings.team),
+    ),
+    StandingsSnapshotWithTeam: (
+        joinedload(StandingsSnapshot.team),
+    ),
+    LeagueWithTeams: (
+        selectinload(League.teams),
+        selectinload(League.standings),
+    ),
+    TeamWithStandings: (
+        selectinload(Team.standings),
+    ),
+}
+
+
+def load_for(query, schema):
+    """Apply the loader profile registered for a response schema to a query"""
+    options = LOADER_PROFILES.get(schema)
+    if not options:
+        return query
+    return query.options(*options)
+
+
+def load_fields(query, schema, fieldset: Optional[Fieldset], *columns):
+    """load_for() for the full response, or the loader options of a sparse fieldset (`?fields=`)"""
+    if fieldset is None:
+        return load_for(query, schema)
+    return narrow(query, fieldset, *columns)
@@ -0,0 +1,81 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is the opaque, URL-safe encoding of the sort key and primary key of
+the last row on a page. The next page starts strictly after that pair, so the
+database seeks straight to it through the index instead of scanning and
+discarding every row before an OFFSET.
+
+SQLite keeps datetimes as text. Values SQLAlchemy writes carry six digits of
+fractional seconds, but CURRENT_TIMESTAMP server defaults (`created_at`) are
+stored without them, so the stored text and a bound datetime do not compare
+as the times they represent. On SQLite the sort column is padded to the same
+width in both the ORDER BY and the cursor filter.
+"""
+
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, and_, case, func, or_, type_coerce
+
+
+def encode_cursor(sort_value: datetime, row_id: UUID) -> str:
+    payload = json.dumps([sort_value.isoformat() if sort_value else None, str(row_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(sort_value) if sort_value else None), UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _sort_key(query, sort_column):
+    """The sort column as an expression that orders and compares like the datetimes it holds"""
+    if not isinstance(sort_column.type, DateTime) or query.session.get_bind().dialect.name != "sqlite":
+        return sort_column
+    # `YYYY-MM-DD HH:MM:SS` (19 characters) from CURRENT_TIMESTAMP gets the `.ffffff` a bound value has
+    padded = case((func.length(sort_column) == 19, sort_column.op("||")(".000000")), else_=sort_column)
+    return type_coerce(padded, sort_column.type)
+
+
+def keyset_page(query, sort_column, id_column, after: str, limit: int, descending: bool = False):
+    """
+    Return (rows, next_cursor) for the page that follows `after`.
+
+    An empty `after` starts from the first row. `next_cursor` is None on the
+    last page.
+    """
+    sort_key = _sort_key(query, sort_column)
+    if descending:
+        query = query.order_by(sort_key.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_key.asc(), id_column.asc())
+
+    if after:
+        sort_value, row_id = decode_cursor(after)
+        if descending:
+            query = query.filter(or_(
+                sort_key < sort_value,
+                and_(sort_key == sort_value, id_column < row_id),
+            ))
+        else:
+            query = query.filter(or_(
+                sort_key > sort_value,
+                and_(sort_key == sort_value, id_column > row_id),
+            ))
+
+    # Fetch one extra row to learn whether another page exists
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
@@ -0,0 +1,91 @@
+"""
+Connection pool with checkout metrics.
+
+InstrumentedQueuePool is a QueuePool that times how long each checkout waits
+for a free connection and counts checkout timeouts. pool_metrics() reports
+those numbers with the pool's current usage. Compare checked_out and the
+wait percentiles against pool_size + max_overflow to size the pool for a
+given number of gunicorn workers.
+"""
+
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    def __init__(self, samples: int = 1024):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        # Most recent checkout waits, in seconds, for the percentiles
+        self.recent = deque(maxlen=samples)
+        self._lock = threading.Lock()
+
+    def record_checkout(self, wait: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.recent.append(wait)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            recent = sorted(self.recent)
+            checkouts, timeouts, total_wait, max_wait = self.checkouts, self.timeouts, self.total_wait, self.max_wait
+
+        def percentile(p):
+            return round(recent[min(len(recent) - 1, int(len(recent) * p))] * 1000, 3) if recent else 0.0
+
+        return {
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "wait_ms": {
+                "avg": round(total_wait / checkouts * 1000, 3) if checkouts else 0.0,
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(max_wait * 1000, 3),
+            },
+        }
+
+
+class InstrumentedQueuePool(QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start)
+        return connection
+
+
+def pool_metrics(engine) -> dict:
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        # NullPool (transaction pooling mode) opens a connection per checkout
+        return {"pool": type(pool).__name__}
+    return {
+        "pool": type(pool).__name__,
+        "pool_size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        **pool.metrics.snapshot(),
+    }
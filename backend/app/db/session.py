@@ -1,8 +1,18 @@
+import hashlib
+import itertools
 import os
+import threading
+import time
+from typing import Dict
+
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
+
+from app.db.pool import InstrumentedQueuePool
 
 # Load environment variables from .env file
 load_dotenv()
@@ -13,16 +23,200 @@ if not DATABASE_URL:
     # Fallback to SQLite for local development
     DATABASE_URL = "sqlite:///./app.db"
 
+# Managed databases are migrated with `alembic upgrade head`; the local SQLite
+# fallback still creates its tables on startup unless told otherwise.
+DB_AUTO_CREATE = os.getenv("DB_AUTO_CREATE", "true" if DATABASE_URL.startswith("sqlite") else "false").lower() == "true"
+
+# Connection pool. DB_POOL_MODE=transaction is for PgBouncer (or Supabase's
+# pooler) in transaction mode: the pooler owns the connections, so the app
+# opens one per checkout and keeps none idle.
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "queue").lower()
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Hosted Postgres drops idle connections; recycle them before that happens
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+
+# SQLite profile for deployments that run on the local database file: WAL so
+# readers are not blocked by a writer, synchronous=NORMAL (safe under WAL),
+# a memory-mapped read path, a larger page cache, a busy timeout so a second
+# writer waits instead of failing with "database is locked", and foreign keys
+# enforced as they are on Postgres. SQLITE_PROFILE=off keeps SQLite's defaults.
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "production").lower()
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# Negative values are KiB, positive values are pages
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))
+
+
+def sqlite_pragmas() -> list:
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size={SQLITE_CACHE_SIZE}",
+        f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}",
+        "PRAGMA foreign_keys=ON",
+    ]
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def apply_sqlite_profile(engine):
+    """Run the SQLite pragmas on each new connection of `engine` (a no-op for other databases)"""
+    if engine.dialect.name == "sqlite" and SQLITE_PROFILE != "off":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+def engine_options() -> dict:
+    if DB_POOL_MODE == "transaction":
+        return {"poolclass": NullPool, "pool_pre_ping": DB_POOL_PRE_PING}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+# Read replicas. GET requests read from one of these (round robin) unless the
+# same client wrote within the last DB_REPLICA_STICKY_SECONDS, so a user
+# always sees their own change even while the replicas are catching up.
+DATABASE_REPLICA_URLS = [
+    url.strip()
+    for url in os.getenv("SB_DB_REPLICA_URLS", os.getenv("SB_DB_REPLICA_URL", "")).split(",")
+    if url.strip()
+]
+DB_REPLICA_STICKY_SECONDS = float(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))
+
+# Statements run with this execution option always go to the primary
+USE_PRIMARY = {"use_primary": True}
+
+
+class RoutingSession(Session):
+    """
+    A Session that reads from `info["replica"]` when one was assigned.
+
+    Flushes and statements marked with USE_PRIMARY go to the primary engine.
+    get_db only assigns a replica to GET/HEAD requests, which do not write.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if replica is not None and not self._flushing:
+            if clause is None or not clause._execution_options.get("use_primary"):
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
 # Set up SQLAlchemy engine and session
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
+engine = apply_sqlite_profile(create_engine(DATABASE_URL, **engine_options()))
+replica_engines = [apply_sqlite_profile(create_engine(url, **engine_options())) for url in DATABASE_REPLICA_URLS]
+# Objects keep their flushed state after commit, so a write handler can build
+# its response without reloading the row
+SessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+
+
+class _ModelBase:
+    # Server-generated columns (created_at, updated_at, ...) come back with
+    # INSERT/UPDATE ... RETURNING in the same statement; backends without
+    # RETURNING read them with a SELECT right after the flush. updated_at
+    # columns declare server_default=null() so a new row's NULL is returned
+    # by the INSERT too instead of being fetched separately.
+    __mapper_args__ = {"eager_defaults": True}
+
+
+Base = declarative_base(cls=_ModelBase)
+
+
+def after_commit(db: Session, callback):
+    """Run `callback` once the session's current transaction commits"""
+    db.info.setdefault("after_commit", []).append(callback)
+
+
+def after_rollback(db: Session, callback):
+    """Run `callback` if the session's current transaction rolls back"""
+    db.info.setdefault("after_rollback", []).append(callback)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _run_after_commit(session):
+    session.info.pop("after_rollback", None)
+    for callback in session.info.pop("after_commit", []):
+        callback()
+
 
+@event.listens_for(SessionLocal, "after_transaction_end")
+def _run_after_rollback(session, transaction):
+    # Reached without a commit when the transaction was rolled back or the
+    # session was closed with uncommitted work
+    if transaction.parent is not None:
+        return
+    session.info.pop("after_commit", None)
+    for callback in session.info.pop("after_rollback", []):
+        callback()
 
-def get_db():
+
+_replica_cycle = itertools.cycle(replica_engines)
+_recent_writers: Dict[str, float] = {}
+_writers_lock = threading.Lock()
+
+
+def _client_key(request: Request) -> str:
+    """The signed-in token if there is one, otherwise the client address"""
+    identity = request.headers.get("authorization") or (request.client.host if request.client else "")
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+def _mark_writer(key: str):
+    now = time.monotonic()
+    with _writers_lock:
+        if len(_recent_writers) > 10000:
+            for stale in [k for k, until in _recent_writers.items() if until <= now]:
+                del _recent_writers[stale]
+        _recent_writers[key] = now + DB_REPLICA_STICKY_SECONDS
+
+
+def _wrote_recently(key: str) -> bool:
+    with _writers_lock:
+        return _recent_writers.get(key, 0) > time.monotonic()
+
+
+def get_db(request: Request):
     """Dependency to get database session"""
     db = SessionLocal()
+    if replica_engines:
+        key = _client_key(request)
+        if request.method not in ("GET", "HEAD"):
+            after_commit(db, lambda: _mark_writer(key))
+        elif _wrote_recently(key):
+            # Cached responses may have been rendered from a replica that lacks this client's write too
+            db.info["recent_writer"] = True
+        else:
+            db.info["replica"] = next(_replica_cycle)
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def sibling_session(db: Session) -> Session:
+    """A new session that reads from the same database (primary or replica) as `db`"""
+    sibling = SessionLocal()
+    if db.info.get("replica") is not None:
+        sibling.info["replica"] = db.info["replica"]
+    return sibling
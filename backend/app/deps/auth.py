@@ -1,16 +1,77 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
 from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
 from jose import JWTError
 from app.db.deps import get_db
+from app.db.session import USE_PRIMARY, after_commit
 from app.core.security import decode_access_token
 from app.models.user import User
 
 # Use HTTPBearer instead of OAuth2PasswordBearer for JWT tokens
 oauth2_scheme = HTTPBearer()
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+# Column values of recently authenticated users, keyed by the token's `sub`.
+# Entries are dropped when a User is updated or deleted through the ORM in this
+# process; a change made by another worker or directly in the database is only
+# seen once the entry expires, so a user can keep their old row for up to
+# USER_CACHE_TTL seconds. Admin checks never read this cache.
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "1024"))
+
+_USER_COLUMNS = [column.key for column in User.__table__.columns]
+_user_cache: "OrderedDict[UUID, tuple]" = OrderedDict()
+_user_cache_lock = threading.Lock()
+_user_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _cached_user(user_id: UUID) -> Optional[dict]:
+    with _user_cache_lock:
+        item = _user_cache.get(user_id)
+        if item is None or item[0] <= time.monotonic():
+            _user_cache.pop(user_id, None)
+            _user_cache_stats["misses"] += 1
+            return None
+        _user_cache.move_to_end(user_id)
+        _user_cache_stats["hits"] += 1
+        return item[1]
+
+
+def _remember_user(user: User):
+    columns = {key: getattr(user, key) for key in _USER_COLUMNS}
+    with _user_cache_lock:
+        _user_cache[user.id] = (time.monotonic() + USER_CACHE_TTL, columns)
+        _user_cache.move_to_end(user.id)
+        while len(_user_cache) > USER_CACHE_MAX_ENTRIES:
+            _user_cache.popitem(last=False)
+
+
+def forget_user(user_id: UUID):
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+
+
+def user_cache_stats() -> dict:
+    with _user_cache_lock:
+        return {**_user_cache_stats, "size": len(_user_cache)}
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _forget_changed_user(mapper, connection, target):
+    # Drop now, and again at commit in case a request re-read the old row in between
+    forget_user(target.id)
+    session = Session.object_session(target)
+    if session is not None:
+        after_commit(session, lambda user_id=target.id: forget_user(user_id))
+
+def _authenticate(token, db: Session, use_cache: bool) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -20,7 +81,8 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     token_str = token.credentials if hasattr(token, "credentials") else token
 
     payload = decode_access_token(token_str)
-    if not payload or "sub" not in payload:
+    # Refresh tokens are only good for /auth/refresh
+    if not payload or "sub" not in payload or payload.get("type") == "refresh":
         raise credentials_exception
 
     try:
@@ -28,13 +90,30 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except (ValueError, TypeError):
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == user_id).first()
+    columns = _cached_user(user_id) if use_cache else None
+    if columns is not None:
+        # Attach a copy to this request's session as if it had just been loaded,
+        # so relationships and later edits behave like a queried User
+        user = User(**columns)
+        make_transient_to_detached(user)
+        db.add(user)
+        return user
+
+    # From the primary: this row is cached, and a lagging replica could hand back a revoked admin flag
+    user = db.query(User).filter(User.id == user_id).execution_options(**USE_PRIMARY).first()
     if not user:
         raise credentials_exception
 
+    _remember_user(user)
+
     return user
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+    return _authenticate(token, db, use_cache=True)
+
+def get_current_admin_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+    # Always from the primary, so a revoked admin flag takes effect on the next request in every worker
+    current_user = _authenticate(token, db, use_cache=False)
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -2,8 +2,13 @@ from fastapi import FastAPI
 from fastapi import APIRouter
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.db.session import engine, Base
-from app.api.routes import auth, player, blog_posts, league, match, admin
+from app.db.session import engine, Base, DB_AUTO_CREATE, SessionLocal
+from app.db.async_session import DB_ASYNC_ROUTES, dispose_async_engine
+from app.services import token_service
+from app.core.security import shutdown_hash_pool
+from app.core.perf import PerfMiddleware
+from app.core.compression import CompressionMiddleware
+from app.api.routes import auth, player, blog_posts, league, match, admin, async_read, home
 
 # Import all models so SQLAlchemy can create tables
 from app.models import league as league_model
@@ -13,6 +18,8 @@ from app.models import match_new as match_model
 from app.models import player as player_model
 from app.models import user as user_model
 from app.models import blog_posts as blog_posts_model
+from app.models import standings_snapshot as standings_snapshot_model
+from app.models import revoked_token as revoked_token_model
 
 app = FastAPI(
     title="Disston API",
@@ -28,8 +35,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Automatically create tables from SQLAlchemy models
-Base.metadata.create_all(bind=engine)
+app.add_middleware(CompressionMiddleware)
+
+# Query count and database time per route, for /api/admin/perf
+app.add_middleware(PerfMiddleware)
+
+# Automatically create tables from SQLAlchemy models (local development only;
+# schema changes ship as Alembic migrations in alembic/versions)
+if DB_AUTO_CREATE:
+    Base.metadata.create_all(bind=engine)
+
+@app.on_event("startup")
+def load_revoked_tokens():
+    db = SessionLocal()
+    try:
+        token_service.purge_expired(db)
+        db.commit()
+        token_service.load_revoked(db)
+    finally:
+        db.close()
+
+@app.on_event("shutdown")
+def stop_password_hashing():
+    shutdown_hash_pool()
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await dispose_async_engine()
 
 # Register all API routes
 router = APIRouter()
@@ -38,12 +70,17 @@ router = APIRouter()
 def health_check():
     return "Distton is healthy"
 
+# Async read routes answer their paths first when enabled
+if DB_ASYNC_ROUTES:
+    router.include_router(async_read.router)
+
 router.include_router(auth.router, prefix="/auth", tags=["auth"])
 router.include_router(player.router, prefix="/players", tags=["players"])
 router.include_router(blog_posts.router, prefix="/blog-posts", tags=["blog-posts"])
 router.include_router(league.router, prefix="/api", tags=["league"])
 router.include_router(match.router, prefix="/api", tags=["match"])
 router.include_router(admin.router, prefix="/api", tags=["admin"])
+router.include_router(home.router, prefix="/api", tags=["home"])
 
 # Include the router in the app
 app.include_router(router)
\ No newline at end of file
@@ -1,7 +1,7 @@
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from sqlalchemy import Column, Integer, String, DateTime, Enum
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, null
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 import enum
@@ -28,9 +28,10 @@ class League(Base):
     
     # Audit timestamps
     created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, onupdate=func.now())
+    updated_at = Column(DateTime, server_default=null(), onupdate=func.now())
     
     # Relationships
     teams = relationship("Team", back_populates="league", cascade="all, delete-orphan")
     standings = relationship("LeagueStandings", back_populates="league", cascade="all, delete-orphan")
     matches = relationship("Match", back_populates="league", cascade="all, delete-orphan")
+    snapshots = relationship("StandingsSnapshot", cascade="all, delete-orphan")
@@ -1,13 +1,16 @@
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func, null
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 
 
 class LeagueStandings(Base):
     __tablename__ = "league_standings"
+    __table_args__ = (
+        Index("ix_league_standings_league_id_position", "league_id", "position"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4)
     
@@ -30,7 +33,7 @@ class LeagueStandings(Base):
     
     # Audit timestamps
     created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, onupdate=func.now())
+    updated_at = Column(DateTime, server_default=null(), onupdate=func.now())
     
     # Relationships
     league = relationship("League", back_populates="standings")
@@ -1,7 +1,7 @@
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Index
+from sqlalchemy.sql import func, null
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 import enum
@@ -17,6 +17,13 @@ class MatchStatusEnum(str, enum.Enum):
 
 class Match(Base):
     __tablename__ = "matches"
+    __table_args__ = (
+        # League fixtures list, ordered by date
+        Index("ix_matches_league_id_match_date", "league_id", "match_date"),
+        # Upcoming/recent fixtures for a team: equality columns first, then the date range
+        Index("ix_matches_home_team_status_date", "home_team_id", "status", "match_date"),
+        Index("ix_matches_away_team_status_date", "away_team_id", "status", "match_date"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4)
     
@@ -52,7 +59,7 @@ class Match(Base):
     
     # Audit timestamps
     created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, onupdate=func.now())
+    updated_at = Column(DateTime, server_default=null(), onupdate=func.now())
     
     # Relationships
     league = relationship("League", back_populates="matches")
@@ -1,12 +1,16 @@
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
+from sqlalchemy.sql import func, null
 from app.db.session import Base
 from sqlalchemy.orm import relationship
 
 class Player(Base):
     __tablename__ = "players"
+    __table_args__ = (
+        # Roster: active players ordered by goals, then assists
+        Index("ix_players_status_goals_assists", "status", "goals", "assists"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4)
 
@@ -40,4 +44,4 @@ class Player(Base):
 
     # Audit Timestamps
     created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, onupdate=func.now())
+    updated_at = Column(DateTime, server_default=null(), onupdate=func.now())
@@ -0,0 +1,18 @@
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class RevokedToken(Base):
+    """A refresh token (by its jti) that may no longer be exchanged for access tokens"""
+    __tablename__ = "revoked_tokens"
+    __table_args__ = (
+        Index("ix_revoked_tokens_expires_at", "expires_at"),
+    )
+
+    jti = Column(String(64), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    # Rows are only needed until the token would have expired anyway
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, server_default=func.now())
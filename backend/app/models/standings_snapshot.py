@@ -0,0 +1,37 @@
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.db.session import Base
+
+
+class StandingsSnapshot(Base):
+    """A team's table line as it stood at the end of one matchday"""
+    __tablename__ = "standings_snapshots"
+    __table_args__ = (
+        UniqueConstraint("league_id", "matchday", "team_id", name="uq_standings_snapshots_league_matchday_team"),
+        Index("ix_standings_snapshots_league_id_matchday", "league_id", "matchday"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # Snapshots go with their league or team
+    league_id = Column(UUID(as_uuid=True), ForeignKey("leagues.id", ondelete="CASCADE"), nullable=False)
+    team_id = Column(UUID(as_uuid=True), ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
+    matchday = Column(Date, nullable=False)
+
+    # Same statistics as LeagueStandings
+    matches_played = Column(Integer, default=0)
+    wins = Column(Integer, default=0)
+    draws = Column(Integer, default=0)
+    losses = Column(Integer, default=0)
+    goals_for = Column(Integer, default=0)
+    goals_against = Column(Integer, default=0)
+    goal_difference = Column(Integer, default=0)
+    points = Column(Integer, default=0)
+    position = Column(Integer, nullable=True)
+
+    created_at = Column(DateTime, server_default=func.now())
+
+    team = relationship("Team", back_populates="snapshots")
@@ -1,7 +1,7 @@
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, null
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 
@@ -22,10 +22,11 @@ class Team(Base):
     
     # Audit timestamps
     created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, onupdate=func.now())
+    updated_at = Column(DateTime, server_default=null(), onupdate=func.now())
     
     # Relationships
     league = relationship("League", back_populates="teams")
     standings = relationship("LeagueStandings", back_populates="team", cascade="all, delete-orphan")
+    snapshots = relationship("StandingsSnapshot", back_populates="team", cascade="all, delete-orphan")
     home_matches = relationship("Match", foreign_keys="Match.home_team_id", back_populates="home_team")
     away_matches = relationship("Match", foreign_keys="Match.away_team_id", back_populates="away_team")
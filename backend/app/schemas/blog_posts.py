@@ -37,6 +37,7 @@ class BlogPostUpdate(BaseModel):
 class BlogPostList(BaseModel):
     posts: list[BlogPostRead]
     total: int
+    next_cursor: Optional[str] = None
 
     class Config:
         orm_mode = True
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import List
+
+from app.schemas.blog_posts import BlogPostRead
+from app.schemas.league import League, LeagueStandingsWithTeam
+from app.schemas.match import MatchWithTeamsAndLeague
+from app.schemas.player import PlayerRead
+
+
+class LeagueTable(BaseModel):
+    league: League
+    standings: List[LeagueStandingsWithTeam]
+
+
+class HomeBundle(BaseModel):
+    upcoming: List[MatchWithTeamsAndLeague]
+    recent: List[MatchWithTeamsAndLeague]
+    # One table per league the club plays in
+    standings: List[LeagueTable]
+    roster: List[PlayerRead]
+    posts: List[BlogPostRead]
@@ -1,7 +1,7 @@
 from uuid import UUID
 from pydantic import BaseModel, Field
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 from app.schemas.enums.league_enum import LeagueTypeEnum
 
 
@@ -34,6 +34,11 @@ class League(LeagueBase):
         from_attributes = True
 
 
+class LeaguePage(BaseModel):
+    items: List[League]
+    next_cursor: Optional[str] = None
+
+
 class LeagueWithTeams(League):
     teams: List["Team"] = []
     standings: List["LeagueStandings"] = []
@@ -64,6 +69,11 @@ class Team(TeamBase):
         from_attributes = True
 
 
+class TeamPage(BaseModel):
+    items: List[Team]
+    next_cursor: Optional[str] = None
+
+
 class TeamWithStandings(Team):
     standings: Optional["LeagueStandings"] = None
 
@@ -111,6 +121,52 @@ class LeagueStandingsWithTeam(LeagueStandings):
     team: Team
 
 
+class StandingsSnapshotWithTeam(LeagueStandingsWithTeam):
+    matchday: date
+
+
+class StandingsHistoryPoint(BaseModel):
+    matchday: date
+    team_id: UUID
+    position: Optional[int] = None
+    points: int
+
+    class Config:
+        from_attributes = True
+
+
+class HeadToHead(BaseModel):
+    league_id: UUID
+    team_a_id: UUID
+    team_b_id: UUID
+    played: int
+    team_a_wins: int
+    team_b_wins: int
+    draws: int
+    team_a_goals: int
+    team_b_goals: int
+    team_a_points: int
+    team_b_points: int
+
+
+class TeamProjection(BaseModel):
+    team_id: UUID
+    team_name: str
+    current_position: Optional[int] = None
+    current_points: int
+    expected_points: float
+    # Index 0 is the probability of finishing first
+    position_probabilities: List[float]
+
+
+class LeagueProjection(BaseModel):
+    league_id: UUID
+    simulations: int
+    remaining_matches: int
+    generated_at: datetime
+    teams: List[TeamProjection]
+
+
 # Update forward references
 LeagueWithTeams.model_rebuild()
 TeamWithStandings.model_rebuild()
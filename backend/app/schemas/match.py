@@ -73,3 +73,8 @@ try:
 except ImportError:
     # Schemas not loaded yet, will be rebuilt when imported
     pass
+
+
+class MatchPage(BaseModel):
+    items: List[MatchWithTeamsAndLeague]
+    next_cursor: Optional[str] = None
@@ -1,6 +1,7 @@
 import email
 from uuid import UUID
 from pydantic import BaseModel, EmailStr, Field
+from typing import Optional
 
 
 class UserCreate(BaseModel):
@@ -21,5 +22,9 @@ class UserLogin(BaseModel):
 
 class TokenResponse(BaseModel):
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
-    user: UserRead
\ No newline at end of file
+    user: UserRead
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
\ No newline at end of file
@@ -2,14 +2,15 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.models.user import User
 from app.schemas.user import UserLogin
-from app.core.security import verify_password, create_access_token
+from starlette.concurrency import run_in_threadpool
+from app.core.security import verify_password_async
+from app.services.token_service import issue_tokens
 
-def authenticate_user(db: Session, login_data: UserLogin) -> str:
-    user = db.query(User).filter(User.email == login_data.email).first()
-    if not user or not verify_password(login_data.password, user.hashed_password):
+async def authenticate_user(db: Session, login_data: UserLogin) -> str:
+    user = await run_in_threadpool(lambda: db.query(User).filter(User.email == login_data.email).first())
+    if not user or not await verify_password_async(login_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
-    token = create_access_token({"sub": str(user.id)})
-    return token, user
+    return issue_tokens(user), user
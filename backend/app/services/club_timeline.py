@@ -0,0 +1,99 @@
+"""
+The club's own fixture timeline, kept in memory for the homepage.
+
+Upcoming and recent fixtures for the club teams are read on every homepage
+visit. Instead of filtering the matches table each time, the (match_date, id)
+pairs of the club's scheduled and completed matches are loaded once into two
+sorted lists. "Upcoming" and "recent" are then a bisect on the current time
+plus a slice of `limit` ids.
+
+The timeline is dropped after any committed write that touches a club match.
+It also expires after CLUB_TIMELINE_TTL seconds, so other worker processes
+pick up the change.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.db.session import after_commit
+from app.models.match_new import Match, MatchStatusEnum
+
+# Comma-separated team ids that count as "the club" (one per league it plays in)
+CLUB_TEAM_IDS = [
+    UUID(team_id.strip())
+    for team_id in os.getenv("CLUB_TEAM_IDS", "e58059d6-5b63-4f65-bb65-0c7e36ceb132").split(",")
+    if team_id.strip()
+]
+CLUB_TIMELINE_TTL = float(os.getenv("CLUB_TIMELINE_TTL", "60"))
+
+
+class ClubTimeline:
+    def __init__(self, scheduled: List[Tuple[datetime, UUID]], completed: List[Tuple[datetime, UUID]]):
+        self.scheduled = sorted(scheduled)
+        self.completed = sorted(completed)
+        self.built_at = time.monotonic()
+
+    def upcoming(self, now: datetime, limit: int) -> List[UUID]:
+        """Ids of the next `limit` scheduled fixtures on or after `now`, soonest first"""
+        start = bisect_left(self.scheduled, (now,))
+        return [match_id for _, match_id in self.scheduled[start:start + limit]]
+
+    def recent(self, now: datetime, limit: int) -> List[UUID]:
+        """Ids of the last `limit` completed fixtures before `now`, latest first"""
+        end = bisect_left(self.completed, (now,))
+        return [match_id for _, match_id in reversed(self.completed[max(0, end - limit):end])]
+
+
+_timeline: Optional[ClubTimeline] = None
+# Bumped whenever the timeline is dropped, so a rebuild that overlapped the drop is not cached
+_generation = 0
+_lock = threading.Lock()
+
+
+def is_club_team(team_id: UUID) -> bool:
+    return team_id in CLUB_TEAM_IDS
+
+
+def build_timeline(db: Session) -> ClubTimeline:
+    rows = db.query(Match.match_date, Match.id, Match.status).filter(
+        or_(Match.home_team_id.in_(CLUB_TEAM_IDS), Match.away_team_id.in_(CLUB_TEAM_IDS)),
+        Match.status.in_([MatchStatusEnum.SCHEDULED, MatchStatusEnum.COMPLETED]),
+    ).all()
+    return ClubTimeline(
+        scheduled=[(match_date, match_id) for match_date, match_id, status in rows if status == MatchStatusEnum.SCHEDULED],
+        completed=[(match_date, match_id) for match_date, match_id, status in rows if status == MatchStatusEnum.COMPLETED],
+    )
+
+
+def get_timeline(db: Session) -> ClubTimeline:
+    global _timeline
+    with _lock:
+        timeline = _timeline
+        generation = _generation
+    if timeline is None or time.monotonic() - timeline.built_at > CLUB_TIMELINE_TTL:
+        timeline = build_timeline(db)
+        with _lock:
+            if _generation == generation:
+                _timeline = timeline
+    return timeline
+
+
+def invalidate():
+    global _timeline, _generation
+    with _lock:
+        _timeline = None
+        _generation += 1
+
+
+def invalidate_on_commit(db: Session, *team_ids: UUID):
+    """Drop the timeline after commit if any of these teams is a club team"""
+    if any(is_club_team(team_id) for team_id in team_ids):
+        after_commit(db, invalidate)
@@ -0,0 +1,245 @@
+"""
+Per-league head-to-head results matrix and table tiebreakers.
+
+Each league's completed results are folded into a few N x N NumPy arrays
+indexed by team, where cell [i, j] holds what team i did against team j. The
+matrix is built from the matches table and kept in a process-wide cache.
+
+A transaction that changes a result keeps the change to itself: the standings
+engine ranks against a copy of the cached matrix with its pending results
+applied. Once the transaction commits, the league's matrix is dropped and the
+next read rebuilds it, as it is after any team is added, moved or removed. A
+rebuild that overlaps such a commit is not cached. Matrices also expire after
+H2H_MATRIX_TTL seconds, so other worker processes pick up the change.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.db.session import after_commit, after_rollback
+from app.models.league_standings import LeagueStandings
+from app.models.match_new import Match, MatchStatusEnum
+from app.models.team import Team
+
+POINTS_FOR_WIN = 3
+POINTS_FOR_DRAW = 1
+H2H_MATRIX_TTL = float(os.getenv("H2H_MATRIX_TTL", "60"))
+
+
+class HeadToHeadMatrix:
+    def __init__(self, team_ids: Iterable[UUID]):
+        self.index: Dict[UUID, int] = {}
+        self.played = np.zeros((0, 0), dtype=np.int32)
+        self.wins = np.zeros((0, 0), dtype=np.int32)
+        self.draws = np.zeros((0, 0), dtype=np.int32)
+        self.goals = np.zeros((0, 0), dtype=np.int32)
+        self.built_at = time.monotonic()
+        # Readers and writers of a shared matrix may be on different threads
+        self._lock = threading.RLock()
+        for team_id in team_ids:
+            self._slot(team_id)
+
+    def _slot(self, team_id: UUID) -> int:
+        """Index of a team, growing the arrays if it has not been seen yet; call with the lock held"""
+        slot = self.index.get(team_id)
+        if slot is None:
+            slot = self.index[team_id] = len(self.index)
+            for name in ("played", "wins", "draws", "goals"):
+                setattr(self, name, np.pad(getattr(self, name), ((0, 1), (0, 1))))
+        return slot
+
+    @property
+    def points(self) -> np.ndarray:
+        return POINTS_FOR_WIN * self.wins + POINTS_FOR_DRAW * self.draws
+
+    def apply(self, home_team_id: UUID, away_team_id: UUID, home_score: int, away_score: int, sign: int = 1):
+        """Add (sign=1) or remove (sign=-1) one completed result"""
+        with self._lock:
+            h, a = self._slot(home_team_id), self._slot(away_team_id)
+            self.played[h, a] += sign
+            self.played[a, h] += sign
+            self.goals[h, a] += sign * home_score
+            self.goals[a, h] += sign * away_score
+            if home_score > away_score:
+                self.wins[h, a] += sign
+            elif away_score > home_score:
+                self.wins[a, h] += sign
+            else:
+                self.draws[h, a] += sign
+                self.draws[a, h] += sign
+
+    def copy(self) -> "HeadToHeadMatrix":
+        with self._lock:
+            clone = HeadToHeadMatrix([])
+            clone.index = dict(self.index)
+            for name in ("played", "wins", "draws", "goals"):
+                setattr(clone, name, getattr(self, name).copy())
+            return clone
+
+    def pair(self, team_a: UUID, team_b: UUID) -> dict:
+        """Record of two teams against each other; all zeros if either has no results yet"""
+        with self._lock:
+            a, b = self.index.get(team_a), self.index.get(team_b)
+            if a is None or b is None:
+                played = wins_a = wins_b = draws = goals_a = goals_b = 0
+            else:
+                played, draws = int(self.played[a, b]), int(self.draws[a, b])
+                wins_a, wins_b = int(self.wins[a, b]), int(self.wins[b, a])
+                goals_a, goals_b = int(self.goals[a, b]), int(self.goals[b, a])
+        return {
+            "played": played,
+            "team_a_wins": wins_a,
+            "team_b_wins": wins_b,
+            "draws": draws,
+            "team_a_goals": goals_a,
+            "team_b_goals": goals_b,
+            "team_a_points": POINTS_FOR_WIN * wins_a + POINTS_FOR_DRAW * draws,
+            "team_b_points": POINTS_FOR_WIN * wins_b + POINTS_FOR_DRAW * draws,
+        }
+
+    def mini_table(self, team_ids: List[UUID]):
+        """Head-to-head (points, goal difference) of each team, counting only games among `team_ids`"""
+        points = np.zeros(len(team_ids), dtype=np.int64)
+        goal_difference = np.zeros(len(team_ids), dtype=np.int64)
+        with self._lock:
+            # Teams without a result yet have no slot and score zero
+            known = [(i, self.index[team_id]) for i, team_id in enumerate(team_ids) if team_id in self.index]
+            if known:
+                rows, slots = [i for i, _ in known], [slot for _, slot in known]
+                block = np.ix_(slots, slots)
+                goals = self.goals[block]
+                points[rows] = self.points[block].sum(axis=1)
+                goal_difference[rows] = goals.sum(axis=1) - goals.sum(axis=0)
+        return points, goal_difference
+
+
+_matrices: Dict[UUID, HeadToHeadMatrix] = {}
+# Bumped whenever a league's matrix is dropped, so a rebuild that overlapped the drop is not cached
+_generations: Dict[UUID, int] = {}
+_lock = threading.Lock()
+# db.info key for the (result, sign) pairs of the session's uncommitted match writes
+PENDING = "head_to_head_pending"
+
+
+def build_matrix(db: Session, league_id: UUID) -> HeadToHeadMatrix:
+    team_ids = [team_id for (team_id,) in db.query(Team.id).filter(Team.league_id == league_id)]
+    matrix = HeadToHeadMatrix(team_ids)
+    results = db.query(Match.home_team_id, Match.away_team_id, Match.home_score, Match.away_score).filter(
+        Match.league_id == league_id,
+        Match.status == MatchStatusEnum.COMPLETED,
+        Match.home_score.isnot(None),
+        Match.away_score.isnot(None),
+    )
+    for home_team_id, away_team_id, home_score, away_score in results:
+        matrix.apply(home_team_id, away_team_id, home_score, away_score)
+    return matrix
+
+
+def _cached(league_id: UUID) -> Optional[HeadToHeadMatrix]:
+    """The cached matrix of a league if it has not expired; call with _lock held"""
+    matrix = _matrices.get(league_id)
+    if matrix is not None and time.monotonic() - matrix.built_at > H2H_MATRIX_TTL:
+        del _matrices[league_id]
+        return None
+    return matrix
+
+
+def get_matrix(db: Session, league_id: UUID) -> HeadToHeadMatrix:
+    """The league's matrix as of the last commit; treat it as read-only"""
+    with _lock:
+        matrix = _cached(league_id)
+        generation = _generations.get(league_id, 0)
+    if matrix is None:
+        matrix = build_matrix(db, league_id)
+        with _lock:
+            if _generations.get(league_id, 0) == generation:
+                _matrices[league_id] = matrix
+    return matrix
+
+
+def matrix_for(db: Session, league_id: UUID) -> HeadToHeadMatrix:
+    """The league's matrix as this session sees it, including its uncommitted results"""
+    pending = [(result, sign) for result, sign in db.info.get(PENDING, ()) if result.league_id == league_id]
+    if not pending:
+        return get_matrix(db, league_id)
+    with _lock:
+        cached = _cached(league_id)
+    if cached is None:
+        # Built inside this transaction after the flush, so it already counts the pending results
+        return build_matrix(db, league_id)
+    matrix = cached.copy()
+    for result, sign in pending:
+        matrix.apply(result.home_team_id, result.away_team_id, result.home_score, result.away_score, sign)
+    return matrix
+
+
+def invalidate(league_id: Optional[UUID] = None):
+    with _lock:
+        league_ids = list(_matrices) if league_id is None else [league_id]
+        for key in league_ids:
+            _matrices.pop(key, None)
+            _generations[key] = _generations.get(key, 0) + 1
+
+
+def invalidate_on_commit(db: Session, *league_ids: Optional[UUID]):
+    """Drop these leagues' matrices once the transaction commits (team added, moved or removed)"""
+    for league_id in {league_id for league_id in league_ids if league_id is not None}:
+        after_commit(db, lambda league_id=league_id: invalidate(league_id))
+
+
+def record_result(db: Session, result, sign: int):
+    """
+    Note that this transaction adds (sign=1) or removes (sign=-1) a
+    standings_service.match_result snapshot.
+
+    Ranking within the transaction sees it through matrix_for(); the cached
+    matrix is dropped only once the transaction commits.
+    """
+    if result is None:
+        return
+    if PENDING not in db.info:
+        db.info[PENDING] = []
+        after_commit(db, lambda: db.info.pop(PENDING, None))
+        after_rollback(db, lambda: db.info.pop(PENDING, None))
+    db.info[PENDING].append((result, sign))
+    invalidate_on_commit(db, result.league_id)
+
+
+def rank_standings(db: Session, league_id: UUID, rows: List[LeagueStandings], matrix=None) -> List[LeagueStandings]:
+    """
+    Order standings rows by points, goal difference, goals scored, then
+    head-to-head points and head-to-head goal difference among the teams still
+    level.
+
+    Rows only need team_id, points, goal_difference and goals_for. Pass
+    `matrix` to rank against a matrix other than the league's as this
+    session sees it.
+    """
+    def overall(row):
+        return (row.points or 0, row.goal_difference or 0, row.goals_for or 0)
+
+    rows = sorted(rows, key=lambda row: tuple(-value for value in overall(row)))
+    ranked, start = [], 0
+    while start < len(rows):
+        end = start + 1
+        while end < len(rows) and overall(rows[end]) == overall(rows[start]):
+            end += 1
+        group = rows[start:end]
+        if len(group) > 1:
+            matrix = matrix if matrix is not None else matrix_for(db, league_id)
+            h2h_points, h2h_gd = matrix.mini_table([row.team_id for row in group])
+            group = [
+                row for _, _, _, row in sorted(
+                    zip(-h2h_points, -h2h_gd, [str(row.team_id) for row in group], group),
+                    key=lambda item: item[:3],
+                )
+            ]
+        ranked.extend(group)
+        start = end
+    return ranked
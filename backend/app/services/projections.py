@@ -0,0 +1,219 @@
+"""
+Monte Carlo projection of final league positions.
+
+Each remaining SCHEDULED match is played out many times at once with NumPy.
+Goals are Poisson draws whose rates come from each team's attack and defence
+so far, shrunk towards the league average. Simulated results are added to
+the current LeagueStandings and every simulated table is ranked by points,
+goal difference and goals scored, with random tie-breaking among teams still
+level (head-to-head is not modelled).
+
+Results are kept in a small LRU (PROJECTION_CACHE_MAX_ENTRIES, expiring after
+PROJECTION_CACHE_TTL seconds). An entry records the response cache's version
+of its `league:{id}` tag, which every match or standings write in that league
+bumps. With the redis cache backend that version is shared, so a write in one
+worker retires the projections held by all of them. The simulation count is
+capped at PROJECTION_MAX_SIMULATIONS and rounded down to a multiple of
+SIMULATION_STEP, which keeps the number of distinct entries per league small.
+
+Set PROJECTION_WORKERS to spread large runs over a process pool.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.cache import get_backend
+from app.db.loaders import load_for
+from app.db.session import after_commit
+from app.models.league_standings import LeagueStandings
+from app.models.match_new import Match, MatchStatusEnum
+from app.schemas.league import LeagueStandingsWithTeam
+
+PROJECTION_WORKERS = int(os.getenv("PROJECTION_WORKERS", "0"))
+PROJECTION_SIMULATIONS = int(os.getenv("PROJECTION_SIMULATIONS", "20000"))
+PROJECTION_MAX_SIMULATIONS = int(os.getenv("PROJECTION_MAX_SIMULATIONS", "20000"))
+PROJECTION_CACHE_MAX_ENTRIES = int(os.getenv("PROJECTION_CACHE_MAX_ENTRIES", "64"))
+PROJECTION_CACHE_TTL = float(os.getenv("PROJECTION_CACHE_TTL", "600"))
+SIMULATION_STEP = 1000
+# Runs at or below this size are not worth the inter-process round trip
+PROCESS_POOL_MIN_SIMULATIONS = 50000
+# Pseudo-matches of league-average football added to every team's record
+SHRINKAGE_MATCHES = 3
+DEFAULT_GOALS_PER_TEAM = 1.4
+
+# (league_id, simulations) -> (built at, league tag version, projection)
+_cache: "OrderedDict[Tuple[UUID, int], tuple]" = OrderedDict()
+_cache_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def simulate_positions(base_points, base_gd, base_gf, home_idx, away_idx, home_rate, away_rate, simulations, seed):
+    """
+    Play out the remaining fixtures `simulations` times.
+
+    Returns (position_counts, points_sum): position_counts[t, p] is how many
+    simulations ended with team t in position p (0-based), and points_sum[t]
+    is team t's final points summed over all simulations.
+    """
+    rng = np.random.default_rng(seed)
+    n_teams, n_matches = len(base_points), len(home_idx)
+
+    home_goals = rng.poisson(home_rate, size=(simulations, n_matches))
+    away_goals = rng.poisson(away_rate, size=(simulations, n_matches))
+
+    # One-hot (match x team) incidence matrices turn per-match results into per-team totals
+    home_of = np.zeros((n_matches, n_teams))
+    away_of = np.zeros((n_matches, n_teams))
+    home_of[np.arange(n_matches), home_idx] = 1
+    away_of[np.arange(n_matches), away_idx] = 1
+
+    home_points = 3 * (home_goals > away_goals) + (home_goals == away_goals)
+    away_points = 3 * (away_goals > home_goals) + (home_goals == away_goals)
+    points = base_points + home_points @ home_of + away_points @ away_of
+    gd = base_gd + (home_goals - away_goals) @ home_of + (away_goals - home_goals) @ away_of
+    gf = base_gf + home_goals @ home_of + away_goals @ away_of
+
+    # Lexicographic (points, gd, gf) folded into one float, plus a random tiebreak
+    score = points * 1e8 + (gd + 5000) * 1e4 + gf + rng.random((simulations, n_teams))
+    order = np.argsort(-score, axis=1)
+    positions = np.argsort(order, axis=1)
+
+    flat = np.arange(n_teams) * n_teams + positions
+    position_counts = np.bincount(flat.ravel(), minlength=n_teams * n_teams).reshape(n_teams, n_teams)
+    return position_counts, points.sum(axis=0)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=PROJECTION_WORKERS)
+        return _pool
+
+
+def _run(inputs, simulations: int):
+    if PROJECTION_WORKERS <= 1 or simulations <= PROCESS_POOL_MIN_SIMULATIONS:
+        return simulate_positions(*inputs, simulations, np.random.SeedSequence())
+
+    chunks = np.array_split(np.arange(simulations), PROJECTION_WORKERS)
+    seeds = np.random.SeedSequence().spawn(len(chunks))
+    futures = [
+        _get_pool().submit(simulate_positions, *inputs, len(chunk), seed)
+        for chunk, seed in zip(chunks, seeds)
+        if len(chunk)
+    ]
+    position_counts, points_sum = 0, 0
+    for future in futures:
+        counts, points = future.result()
+        position_counts = position_counts + counts
+        points_sum = points_sum + points
+    return position_counts, points_sum
+
+
+def _goal_rates(standings, home_idx, away_idx):
+    """Expected goals for each fixture from shrunk attack/defence ratings"""
+    played = np.array([row.matches_played or 0 for row in standings], dtype=float)
+    scored = np.array([row.goals_for or 0 for row in standings], dtype=float)
+    conceded = np.array([row.goals_against or 0 for row in standings], dtype=float)
+
+    league_average = scored.sum() / played.sum() if played.sum() else DEFAULT_GOALS_PER_TEAM
+    league_average = league_average or DEFAULT_GOALS_PER_TEAM
+    prior = SHRINKAGE_MATCHES * league_average
+    attack = (scored + prior) / (played + SHRINKAGE_MATCHES) / league_average
+    defence = (conceded + prior) / (played + SHRINKAGE_MATCHES) / league_average
+
+    home_rate = league_average * attack[home_idx] * defence[away_idx]
+    away_rate = league_average * attack[away_idx] * defence[home_idx]
+    return home_rate, away_rate
+
+
+def _league_version(league_id: UUID) -> Optional[int]:
+    backend = get_backend()
+    return backend.versions([f"league:{league_id}"])[0] if backend is not None else None
+
+
+def project_league(db: Session, league_id: UUID, simulations: int) -> dict:
+    simulations = max(SIMULATION_STEP, min(simulations, PROJECTION_MAX_SIMULATIONS) // SIMULATION_STEP * SIMULATION_STEP)
+    key = (league_id, simulations)
+    # Read before the queries, so a write that lands meanwhile leaves the entry stale
+    version = _league_version(league_id)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            built_at, cached_version, projection = cached
+            if cached_version == version and time.monotonic() - built_at <= PROJECTION_CACHE_TTL:
+                _cache.move_to_end(key)
+                return projection
+            del _cache[key]
+
+    standings = load_for(db.query(LeagueStandings), LeagueStandingsWithTeam).filter(
+        LeagueStandings.league_id == league_id
+    ).order_by(LeagueStandings.position.asc()).all()
+    slot = {row.team_id: i for i, row in enumerate(standings)}
+
+    fixtures = db.query(Match.home_team_id, Match.away_team_id).filter(
+        Match.league_id == league_id,
+        Match.status == MatchStatusEnum.SCHEDULED,
+    ).all()
+    # Fixtures against teams without a standings row cannot move the table
+    fixtures = [(home, away) for home, away in fixtures if home in slot and away in slot]
+    home_idx = np.array([slot[home] for home, _ in fixtures], dtype=np.intp)
+    away_idx = np.array([slot[away] for _, away in fixtures], dtype=np.intp)
+
+    base_points = np.array([row.points or 0 for row in standings], dtype=float)
+    base_gd = np.array([row.goal_difference or 0 for row in standings], dtype=float)
+    base_gf = np.array([row.goals_for or 0 for row in standings], dtype=float)
+    home_rate, away_rate = _goal_rates(standings, home_idx, away_idx)
+
+    if standings:
+        position_counts, points_sum = _run(
+            (base_points, base_gd, base_gf, home_idx, away_idx, home_rate, away_rate), simulations
+        )
+    else:
+        position_counts, points_sum = np.zeros((0, 0)), np.zeros(0)
+
+    projection = {
+        "league_id": league_id,
+        "simulations": simulations,
+        "remaining_matches": len(fixtures),
+        "generated_at": datetime.now(),
+        "teams": [
+            {
+                "team_id": row.team_id,
+                "team_name": row.team.name,
+                "current_position": row.position,
+                "current_points": row.points or 0,
+                "expected_points": round(float(points_sum[i]) / simulations, 2),
+                "position_probabilities": [round(float(p), 4) for p in position_counts[i] / simulations],
+            }
+            for i, row in enumerate(standings)
+        ],
+    }
+    with _cache_lock:
+        _cache[key] = (time.monotonic(), version, projection)
+        _cache.move_to_end(key)
+        while len(_cache) > PROJECTION_CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return projection
+
+
+def invalidate(league_id: UUID):
+    with _cache_lock:
+        for key in [key for key in _cache if key[0] == league_id]:
+            del _cache[key]
+
+
+def invalidate_on_commit(db: Session, *league_ids: UUID):
+    """Drop cached projections for these leagues once the current transaction commits"""
+    for league_id in {league_id for league_id in league_ids if league_id is not None}:
+        after_commit(db, lambda league_id=league_id: invalidate(league_id))
@@ -0,0 +1,328 @@
+from collections import defaultdict
+from datetime import date, datetime, time
+from types import SimpleNamespace
+from typing import Dict, Iterable, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, case, func, insert, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.league_standings import LeagueStandings
+from app.models.match_new import Match, MatchStatusEnum
+from app.models.standings_snapshot import StandingsSnapshot
+from app.models.team import Team
+from app.services.head_to_head import POINTS_FOR_DRAW, POINTS_FOR_WIN, HeadToHeadMatrix, rank_standings, record_result
+
+STAT_FIELDS = ("matches_played", "wins", "draws", "losses", "goals_for", "goals_against", "goal_difference", "points")
+
+
+class MatchResult(NamedTuple):
+    league_id: UUID
+    home_team_id: UUID
+    away_team_id: UUID
+    home_score: int
+    away_score: int
+    match_date: datetime
+
+
+def match_result(match) -> Optional[MatchResult]:
+    """
+    The part of a match that counts towards the table, or None if it does not count.
+
+    Take this snapshot before mutating a match so the old contribution can be
+    reversed afterwards.
+    """
+    if match is None or match.status != MatchStatusEnum.COMPLETED:
+        return None
+    if match.home_score is None or match.away_score is None:
+        return None
+    return MatchResult(
+        match.league_id, match.home_team_id, match.away_team_id, match.home_score, match.away_score, match.match_date
+    )
+
+
+def team_line(goals_for: int, goals_against: int) -> Dict[str, int]:
+    """Table contribution of a single completed match for one team"""
+    won, drawn = goals_for > goals_against, goals_for == goals_against
+    return {
+        "matches_played": 1,
+        "wins": int(won),
+        "draws": int(drawn),
+        "losses": int(not won and not drawn),
+        "goals_for": goals_for,
+        "goals_against": goals_against,
+        "goal_difference": goals_for - goals_against,
+        "points": POINTS_FOR_WIN if won else POINTS_FOR_DRAW if drawn else 0,
+    }
+
+
+def _accumulate(deltas, result, sign: int):
+    if result is None:
+        return
+    for team_id, gf, ga in (
+        (result.home_team_id, result.home_score, result.away_score),
+        (result.away_team_id, result.away_score, result.home_score),
+    ):
+        line = deltas[(result.league_id, team_id)]
+        for field, value in team_line(gf, ga).items():
+            line[field] += sign * value
+
+
+def rerank_league(db: Session, league_id: UUID) -> int:
+    """Recompute positions for one league, writing only the rows that moved"""
+    rows = db.query(LeagueStandings).filter(LeagueStandings.league_id == league_id).all()
+    moved = 0
+    for position, row in enumerate(rank_standings(db, league_id, rows), 1):
+        if row.position != position:
+            row.position = position
+            moved += 1
+    return moved
+
+
+def apply_match_change(db: Session, before, after) -> None:
+    """
+    Apply the difference between two match_result snapshots to the table.
+
+    Only the standings rows of the teams involved are touched, and positions
+    are re-ranked for the affected league(s). Nothing is committed here; the
+    changes ride on the caller's transaction with the match write itself.
+    """
+    if before == after:
+        return
+
+    deltas = defaultdict(lambda: defaultdict(int))
+    _accumulate(deltas, before, -1)
+    _accumulate(deltas, after, +1)
+
+    # Ranking below sees these through head_to_head.matrix_for
+    record_result(db, before, -1)
+    record_result(db, after, +1)
+
+    leagues = set()
+    for (league_id, team_id), line in deltas.items():
+        if not any(line.values()):
+            continue
+        row = db.query(LeagueStandings).filter(
+            LeagueStandings.league_id == league_id,
+            LeagueStandings.team_id == team_id,
+        ).first()
+        if row is None:
+            row = LeagueStandings(league_id=league_id, team_id=team_id, **{field: 0 for field in STAT_FIELDS})
+            db.add(row)
+        for field, value in line.items():
+            setattr(row, field, (getattr(row, field) or 0) + value)
+        leagues.add(league_id)
+
+    db.flush()
+    for league_id in leagues:
+        rerank_league(db, league_id)
+    db.flush()
+
+    # Matchday snapshots: a result moved to another date changes no totals but
+    # still changes the table as it stood on both days
+    matchdays = defaultdict(set)
+    for result in (before, after):
+        if result is not None:
+            matchdays[result.league_id].add(result.match_date.date())
+    for league_id, days in matchdays.items():
+        record_matchdays(db, league_id, days)
+
+
+def _counted(league_id: UUID):
+    """Filter for the matches of a league that count towards its table"""
+    return and_(
+        Match.league_id == league_id,
+        Match.status == MatchStatusEnum.COMPLETED,
+        Match.home_score.isnot(None),
+        Match.away_score.isnot(None),
+    )
+
+
+def compute_standings(db: Session, league_id: UUID) -> Dict[UUID, Dict[str, int]]:
+    """
+    Derive every team's table line for a league straight from completed matches.
+
+    This is a single aggregate query: a UNION ALL of the home and away view of
+    each result, grouped by team. Teams without a completed match are not in
+    the result.
+    """
+    counted = _counted(league_id)
+    perspectives = union_all(
+        select(Match.home_team_id.label("team_id"), Match.home_score.label("gf"), Match.away_score.label("ga")).where(counted),
+        select(Match.away_team_id.label("team_id"), Match.away_score.label("gf"), Match.home_score.label("ga")).where(counted),
+    ).subquery()
+
+    gf, ga = perspectives.c.gf, perspectives.c.ga
+    query = select(
+        perspectives.c.team_id,
+        func.count().label("matches_played"),
+        func.sum(case((gf > ga, 1), else_=0)).label("wins"),
+        func.sum(case((gf == ga, 1), else_=0)).label("draws"),
+        func.sum(case((gf < ga, 1), else_=0)).label("losses"),
+        func.sum(gf).label("goals_for"),
+        func.sum(ga).label("goals_against"),
+        func.sum(gf - ga).label("goal_difference"),
+        func.sum(case((gf > ga, POINTS_FOR_WIN), (gf == ga, POINTS_FOR_DRAW), else_=0)).label("points"),
+    ).group_by(perspectives.c.team_id)
+
+    return {
+        row.team_id: {field: int(getattr(row, field) or 0) for field in STAT_FIELDS}
+        for row in db.execute(query)
+    }
+
+
+def standings_drift(db: Session, league_id: UUID):
+    """List (team_id, field, stored, expected) for every stored value that disagrees with the matches"""
+    expected = compute_standings(db, league_id)
+    stored = {
+        row.team_id: row
+        for row in db.query(LeagueStandings).filter(LeagueStandings.league_id == league_id)
+    }
+    zero = {field: 0 for field in STAT_FIELDS}
+    drift = []
+    for team_id in set(expected) | set(stored):
+        row = stored.get(team_id)
+        for field, value in expected.get(team_id, zero).items():
+            current = (getattr(row, field) or 0) if row is not None else None
+            if current != value:
+                drift.append((team_id, field, current, value))
+    return drift
+
+
+def rebuild_standings(db: Session, league_id: UUID) -> int:
+    """
+    Overwrite a league's table with the values derived from its matches.
+
+    Every team in the league gets a row (zeros if it has not played), positions
+    are re-ranked, and the number of rows whose values changed is returned.
+    Nothing is committed here.
+    """
+    expected = compute_standings(db, league_id)
+    rows = {
+        row.team_id: row
+        for row in db.query(LeagueStandings).filter(LeagueStandings.league_id == league_id)
+    }
+    team_ids = set(expected) | {team_id for (team_id,) in db.query(Team.id).filter(Team.league_id == league_id)}
+
+    zero = {field: 0 for field in STAT_FIELDS}
+    changed = 0
+    for team_id in team_ids:
+        row = rows.get(team_id)
+        if row is None:
+            row = LeagueStandings(league_id=league_id, team_id=team_id)
+            db.add(row)
+            rows[team_id] = row
+        line = expected.get(team_id, zero)
+        if any(getattr(row, field) != value for field, value in line.items()):
+            for field, value in line.items():
+                setattr(row, field, value)
+            changed += 1
+
+    db.flush()
+    rerank_league(db, league_id)
+    return changed
+
+
+def snapshot_current(db: Session, league_id: UUID, matchday: date) -> None:
+    """Store the live table as the league's snapshot for `matchday`"""
+    db.query(StandingsSnapshot).filter(
+        StandingsSnapshot.league_id == league_id,
+        StandingsSnapshot.matchday == matchday,
+    ).delete(synchronize_session=False)
+    rows = db.query(LeagueStandings).filter(LeagueStandings.league_id == league_id).all()
+    db.add_all(
+        StandingsSnapshot(
+            league_id=league_id,
+            team_id=row.team_id,
+            matchday=matchday,
+            position=row.position,
+            **{field: getattr(row, field) or 0 for field in STAT_FIELDS},
+        )
+        for row in rows
+    )
+
+
+def backfill_snapshots(db: Session, league_id: UUID, since: Optional[date] = None) -> int:
+    """
+    Rebuild a league's matchday snapshots from its results in one pass.
+
+    Completed matches are read once, ordered by match_date, and folded into a
+    running table (and head-to-head matrix for tiebreakers). The ranked table
+    is emitted at the end of every matchday. With `since`, only snapshots from
+    that day on are replaced. Returns the number of matchdays written.
+    """
+    team_ids = [team_id for (team_id,) in db.query(Team.id).filter(Team.league_id == league_id)]
+    table = {team_id: dict.fromkeys(STAT_FIELDS, 0) for team_id in team_ids}
+    matrix = HeadToHeadMatrix(team_ids)
+
+    results = db.query(
+        Match.match_date, Match.home_team_id, Match.away_team_id, Match.home_score, Match.away_score
+    ).filter(_counted(league_id)).order_by(Match.match_date.asc()).all()
+
+    stale = db.query(StandingsSnapshot).filter(StandingsSnapshot.league_id == league_id)
+    if since is not None:
+        stale = stale.filter(StandingsSnapshot.matchday >= since)
+    stale.delete(synchronize_session=False)
+
+    snapshot_rows = []
+    matchdays = 0
+
+    def emit(matchday):
+        lines = [SimpleNamespace(team_id=team_id, **line) for team_id, line in table.items()]
+        for position, line in enumerate(rank_standings(db, league_id, lines, matrix=matrix), 1):
+            snapshot_rows.append({
+                "league_id": league_id,
+                "team_id": line.team_id,
+                "matchday": matchday,
+                "position": position,
+                **{field: getattr(line, field) for field in STAT_FIELDS},
+            })
+
+    current_day = None
+    for match_date, home_team_id, away_team_id, home_score, away_score in results:
+        day = match_date.date()
+        if current_day is not None and day != current_day and (since is None or current_day >= since):
+            emit(current_day)
+            matchdays += 1
+        current_day = day
+
+        for team_id, gf, ga in ((home_team_id, home_score, away_score), (away_team_id, away_score, home_score)):
+            line = table.setdefault(team_id, dict.fromkeys(STAT_FIELDS, 0))
+            for field, value in team_line(gf, ga).items():
+                line[field] += value
+        matrix.apply(home_team_id, away_team_id, home_score, away_score)
+
+    if current_day is not None and (since is None or current_day >= since):
+        emit(current_day)
+        matchdays += 1
+
+    if snapshot_rows:
+        db.execute(insert(StandingsSnapshot), snapshot_rows)
+    return matchdays
+
+
+def record_matchdays(db: Session, league_id: UUID, matchdays: Iterable[date]) -> None:
+    """
+    Bring a league's snapshots up to date after results on `matchdays` changed.
+
+    The common case, a result entered on the latest matchday, copies the live
+    table. Corrections to earlier matchdays replay the season from the
+    earliest affected day.
+    """
+    matchdays = set(matchdays)
+    first = min(matchdays)
+    latest = db.query(func.max(Match.match_date)).filter(
+        _counted(league_id),
+        Match.match_date >= datetime.combine(first, time.min),
+    ).scalar()
+
+    if latest is None:
+        # No results left on or after the earliest day
+        db.query(StandingsSnapshot).filter(
+            StandingsSnapshot.league_id == league_id,
+            StandingsSnapshot.matchday >= first,
+        ).delete(synchronize_session=False)
+    elif matchdays == {latest.date()}:
+        snapshot_current(db, league_id, first)
+    else:
+        backfill_snapshots(db, league_id, since=first)
@@ -0,0 +1,128 @@
+"""
+Refresh tokens and their revocation index.
+
+Login hands out a short-lived access token and a long-lived refresh token.
+/auth/refresh trades a refresh token for a new pair without a password (and
+so without bcrypt), and retires the old refresh token. /auth/logout retires
+one without issuing anything.
+
+Retired refresh tokens are stored by jti in revoked_tokens until they would
+have expired. Every process keeps the unexpired jtis in a set:
+- loaded at startup,
+- updated at once for revocations made by this process,
+- reloaded every REVOKED_TOKENS_RESYNC seconds to pick up the other workers.
+Checking a valid token is then a set lookup.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Set
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.security import create_access_token, create_refresh_token, decode_access_token
+from app.db.session import after_commit
+from app.models.revoked_token import RevokedToken
+from app.models.user import User
+
+REVOKED_TOKENS_RESYNC = float(os.getenv("REVOKED_TOKENS_RESYNC", "30"))
+
+_revoked: Set[str] = set()
+_synced_at: Optional[float] = None
+_lock = threading.Lock()
+
+
+def load_revoked(db: Session):
+    """Replace the in-memory index with the unexpired rows of revoked_tokens"""
+    global _revoked, _synced_at
+    jtis = {jti for (jti,) in db.query(RevokedToken.jti).filter(RevokedToken.expires_at > datetime.utcnow())}
+    with _lock:
+        _revoked = jtis
+        _synced_at = time.monotonic()
+
+
+def purge_expired(db: Session) -> int:
+    """Delete rows for tokens that have expired on their own; nothing is committed here"""
+    return db.query(RevokedToken).filter(RevokedToken.expires_at <= datetime.utcnow()).delete(synchronize_session=False)
+
+
+def is_revoked(db: Session, jti: str) -> bool:
+    with _lock:
+        stale = _synced_at is None or time.monotonic() - _synced_at > REVOKED_TOKENS_RESYNC
+    if stale:
+        load_revoked(db)
+    with _lock:
+        return jti in _revoked
+
+
+def issue_tokens(user: User) -> dict:
+    return {
+        "access_token": create_access_token({"sub": str(user.id)}),
+        "refresh_token": create_refresh_token(str(user.id)),
+    }
+
+
+def _verified_refresh_claims(db: Session, refresh_token: str) -> dict:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+    )
+    claims = decode_access_token(refresh_token)
+    if not claims or claims.get("type") != "refresh" or "jti" not in claims or "sub" not in claims:
+        raise credentials_exception
+    if is_revoked(db, claims["jti"]):
+        raise credentials_exception
+    return claims
+
+
+def _remember_revoked(jti: str):
+    with _lock:
+        _revoked.add(jti)
+
+
+def revoke(db: Session, claims: dict):
+    """
+    Record a refresh token as revoked and commit; this process stops
+    accepting it at once.
+
+    The jti is the primary key, so when two requests race to use the same
+    refresh token only the first commit succeeds and the other gets a 401.
+    """
+    jti = claims["jti"]
+    db.add(RevokedToken(
+        jti=jti,
+        user_id=UUID(claims["sub"]),
+        expires_at=datetime.utcfromtimestamp(claims["exp"]),
+    ))
+    after_commit(db, lambda: _remember_revoked(jti))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        _remember_revoked(jti)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+
+def refresh_tokens(db: Session, refresh_token: str):
+    """Exchange a refresh token for a new access/refresh pair, retiring the old one"""
+    claims = _verified_refresh_claims(db, refresh_token)
+    try:
+        user_id = UUID(claims["sub"])
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+    revoke(db, claims)
+    return issue_tokens(user), user
+
+
+def logout(db: Session, refresh_token: str):
+    claims = _verified_refresh_claims(db, refresh_token)
+    revoke(db, claims)
@@ -2,11 +2,12 @@ import email
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserCreate
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
 
-def create_user(db: Session, user: UserCreate) -> User:
-    existing_user = db.query(User).filter(User.email == user.email).first()
+async def create_user(db: Session, user: UserCreate) -> User:
+    existing_user = await run_in_threadpool(lambda: db.query(User).filter(User.email == user.email).first())
 
     if existing_user:
         raise HTTPException(
@@ -14,7 +15,7 @@ def create_user(db: Session, user: UserCreate) -> User:
             detail="Email already registered"
         )
 
-    hashed_pw = get_password_hash(user.password)
+    hashed_pw = await get_password_hash_async(user.password)
 
     new_user = User(
         email = user.email,
@@ -22,7 +23,9 @@ def create_user(db: Session, user: UserCreate) -> User:
         is_admin = False
     )
 
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    def save():
+        db.add(new_user)
+        db.commit()
+
+    await run_in_threadpool(save)
     return new_user
\ No newline at end of file
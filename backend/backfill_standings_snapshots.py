@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Backfill per-matchday standings snapshots from historic results.
+
+Each league is replayed in a single pass over its completed matches ordered
+by match_date, and its snapshots are replaced in one transaction.
+
+Usage:
+    python backfill_standings_snapshots.py                  # every league
+    python backfill_standings_snapshots.py --league <uuid>  # one league
+    python backfill_standings_snapshots.py --since 2025-09-01
+"""
+
+import argparse
+from datetime import date
+from uuid import UUID
+
+from app.core.cache import invalidate_on_commit
+from app.db.session import SessionLocal
+from app.models.league import League
+from app.models.team import Team
+from app.models.league_standings import LeagueStandings
+from app.models.match_new import Match
+from app.models.standings_snapshot import StandingsSnapshot
+from app.services.standings_service import backfill_snapshots
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--league", action="append", type=UUID, help="league id (repeatable; default: all leagues)")
+    parser.add_argument("--since", type=date.fromisoformat, help="only replace snapshots from this day on")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        league_ids = args.league or [league_id for (league_id,) in db.query(League.id)]
+        for league_id in league_ids:
+            matchdays = backfill_snapshots(db, league_id, since=args.since)
+            # Reaches running servers only through a shared (redis) cache backend
+            invalidate_on_commit(db, "standings", f"league:{league_id}")
+            db.commit()
+            print(f"{league_id}: {matchdays} matchdays")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Throughput of the sync (threadpool) read routes versus the async ones.
+
+Seeds a scratch database, then starts the app under uvicorn twice: once with
+DB_ASYNC_ROUTES=false and once with DB_ASYNC_ROUTES=true. The response cache
+is off both times so every request reaches the database. Each run keeps
+--concurrency keep-alive connections busy for --seconds, cycling through
+the match list, standings, roster and blog list, and prints requests/s and
+latency percentiles.
+
+Usage:
+    python benchmark_async_routes.py
+    python benchmark_async_routes.py --concurrency 500 --seconds 20
+    python benchmark_async_routes.py --url postgresql://...   # an empty scratch database
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from sqlalchemy import create_engine
+
+from app.db.session import Base
+from app.models import revoked_token, standings_snapshot  # noqa: F401  (tables the app reads at startup)
+from benchmark_indexes import seed
+
+HOST = "127.0.0.1"
+
+
+async def fetch(reader, writer, path, method="GET", body=b""):
+    head = f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\n"
+    if body:
+        head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+    writer.write(head.encode() + b"\r\n" + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(port, paths, offset, deadline, latencies, failures):
+    reader, writer = await asyncio.open_connection(HOST, port)
+    i = offset
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status = await fetch(reader, writer, paths[i % len(paths)])
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                failures.append(status)
+            i += 1
+    finally:
+        writer.close()
+
+
+async def load(port, paths, concurrency, seconds):
+    latencies, failures = [], []
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*(
+        client(port, paths, n, deadline, latencies, failures) for n in range(concurrency)
+    ))
+    return latencies, failures
+
+
+def serve(port, url, workers=1, **settings):
+    """Start the app under uvicorn with the response cache off; `settings` are extra env vars"""
+    env = dict(os.environ)
+    env.update({
+        "SB_DB_URL": url,
+        "DB_AUTO_CREATE": "false",
+        "CACHE_BACKEND": "off",
+        **settings,
+    })
+    env.setdefault("SECRET_KEY", "benchmark-async-routes")
+    env.setdefault("ALGORITHM", "HS256")
+    env.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://{HOST}:{port}/health", timeout=1).read()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("server did not come up")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="scratch database URL (defaults to a temporary SQLite file)")
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'benchmark_async.db')}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    league_id, _ = seed(engine, leagues=4, teams_per_league=12, seasons=2, players=300, posts=300)
+    engine.dispose()
+
+    paths = [
+        "/api/matches/?limit=50",
+        f"/api/standings/league/{league_id}",
+        "/players/roster",
+        "/blog-posts/",
+    ]
+    results = {}
+    for label, async_routes in (("sync (threadpool)", False), ("async", True)):
+        server = serve(args.port, url, DB_ASYNC_ROUTES="true" if async_routes else "false")
+        try:
+            asyncio.run(load(args.port, paths, 10, 1))  # warm up
+            latencies, failures = asyncio.run(load(args.port, paths, args.concurrency, args.seconds))
+        finally:
+            server.terminate()
+            server.wait()
+        latencies.sort()
+        results[label] = len(latencies) / args.seconds
+        print(f"{label:<18} {results[label]:8.0f} req/s  p50={statistics.median(latencies):7.1f} ms  "
+              f"p99={latencies[int(len(latencies) * 0.99) - 1]:7.1f} ms  errors={len(failures)}")
+
+    print(f"async / sync throughput: {results['async'] / results['sync (threadpool)']:.2f}x "
+          f"at {args.concurrency} concurrent connections")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark for sparse fieldsets (`?fields=`, app/db/fieldsets.py).
+
+Seeds a scratch SQLite database and fills the wide text columns a list card
+never shows: match venue and notes, and player contact details. For each list,
+the script runs the query and serializes the result twice, once in full and
+once with a typical card's fieldset. It prints:
+
+- the columns per row and the bytes the database hands back,
+- the size of the JSON body,
+- the median time of query plus serialization.
+
+Usage:
+    python benchmark_fieldsets.py
+    python benchmark_fieldsets.py --repeat 50
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+
+from app.core.serialization import dump_json
+from app.db.fieldsets import narrow, parse_fields, shape
+from app.db.loaders import load_fields
+from app.db.session import Base
+from app.models.match_new import Match
+from app.models.player import Player
+from app.models import blog_posts, revoked_token, standings_snapshot  # noqa: F401  (complete metadata for create_all)
+from app.schemas.match import MatchWithTeamsAndLeague
+from app.schemas.player import PlayerRead
+from benchmark_indexes import seed
+
+MATCH_CARD = "match_date,home_score,away_score,status,home_team.name,away_team.name"
+ROSTER_CARD = "first_name,last_name,jersey_number,position,goals,assists"
+
+
+def fill_wide_columns(engine):
+    """Give the columns the cards leave out realistic lengths"""
+    with engine.begin() as conn:
+        conn.execute(update(Match).values(
+            venue_name="Puryear Park",
+            field_name="Puryear Park Field 1",
+            full_location="Puryear Park Field 1, 2001 37th St S, St. Petersburg, FL 33711",
+            match_type="Regular Season",
+            division="Men Second (11v11)",
+            notes="Arrive 30 minutes early. Bring both kits; the referee decides colours on the day.",
+        ))
+        conn.execute(update(Player).values(
+            email="player@example.com",
+            phone_number="(727) 555-0100",
+            profile_image_url="https://images.example.com/players/profile-photo-with-a-long-name.jpg",
+        ))
+
+
+def fetched(db: Session, query):
+    """(columns per row, bytes of column values) for what the database returns"""
+    rows = db.connection().execute(query.statement).all()
+    columns = len(rows[0]) if rows else 0
+    return columns, sum(len(str(value)) for row in rows for value in row if value is not None)
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'benchmark_fieldsets.db')}")
+    Base.metadata.create_all(bind=engine)
+    seed(engine, leagues=4, teams_per_league=12, seasons=2, players=500, posts=1)
+    fill_wide_columns(engine)
+
+    def matches(fields):
+        def run(db):
+            fieldset = parse_fields(fields, MatchWithTeamsAndLeague, Match)
+            query = load_fields(db.query(Match), MatchWithTeamsAndLeague, fieldset).order_by(Match.match_date).limit(1000)
+            return query, lambda: dump_json(List[MatchWithTeamsAndLeague], shape(fieldset, query.all()))
+        return run
+
+    def roster(fields):
+        def run(db):
+            fieldset = parse_fields(fields, PlayerRead, Player)
+            query = narrow(db.query(Player), fieldset).filter(Player.status == 1).order_by(Player.goals.desc())
+            return query, lambda: dump_json(List[PlayerRead], shape(fieldset, query.all()))
+        return run
+
+    cases = [("1000 matches", matches, MATCH_CARD), ("roster", roster, ROSTER_CARD)]
+    print(f"{'list':<14} {'fields':<7} {'columns':>7} {'fetched':>9} {'json':>9} {'median':>9}")
+    for label, build, card in cases:
+        results = {}
+        for name, fields in (("all", None), ("card", card)):
+            # A new session per run, as a request would have, so the identity map starts empty
+            with Session(engine) as db:
+                query, _ = build(fields)(db)
+                columns, fetched_bytes = fetched(db, query)
+            with Session(engine) as db:
+                body = build(fields)(db)[1]()
+
+            def run_once():
+                with Session(engine) as db:
+                    build(fields)(db)[1]()
+
+            ms = timed(run_once, args.repeat)
+            results[name] = (len(body), ms)
+            print(f"{label:<14} {name:<7} {columns:>7} {fetched_bytes:>9} {len(body):>9} {ms:>7.1f}ms")
+        (full_bytes, full_ms), (card_bytes, card_ms) = results["all"], results["card"]
+        print(f"{'':<14} {'':<7} {'':>7} {'':>9} {full_bytes / card_bytes:>8.1f}x {full_ms / card_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
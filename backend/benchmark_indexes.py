@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the hot-query composite indexes (alembic revision 0002).
+
+Seeds a scratch database with several seasons of fixtures, then runs the hot
+match, standings, roster and blog queries twice: once without the composite
+indexes and once with them. For each query it prints the EXPLAIN plan and the
+median latency.
+
+Usage:
+    python benchmark_indexes.py                       # temporary SQLite file
+    python benchmark_indexes.py --url postgresql://...  # an empty scratch database
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event, insert, or_, select, text
+
+from app.db.session import Base
+from app.models.blog_posts import Post
+from app.models.league import League, LeagueTypeEnum
+from app.models.league_standings import LeagueStandings
+from app.models.match_new import Match, MatchStatusEnum
+from app.models.player import Player
+from app.models.team import Team
+from app.models.user import User
+
+HOT_QUERY_INDEXES = {
+    "ix_matches_league_id_match_date",
+    "ix_matches_home_team_status_date",
+    "ix_matches_away_team_status_date",
+    "ix_league_standings_league_id_position",
+    "ix_players_status_goals_assists",
+    "ix_posts_is_published_created_at",
+}
+
+
+def seed(engine, leagues, teams_per_league, seasons, players, posts):
+    """Bulk insert a synthetic dataset; returns (league_id, team_id) to query"""
+    rng = random.Random(42)
+    now = datetime.now()
+
+    league_rows, team_rows, standing_rows, match_rows = [], [], [], []
+    for l in range(leagues):
+        league_id = uuid.uuid4()
+        league_rows.append({"id": league_id, "name": f"League {l}", "league_type": LeagueTypeEnum.SUNCOAST,
+                            "season": "2025/2026", "is_active": 1})
+        team_ids = [uuid.uuid4() for _ in range(teams_per_league)]
+        for position, team_id in enumerate(team_ids, 1):
+            team_rows.append({"id": team_id, "name": f"Team {l}-{position}", "league_id": league_id, "is_active": 1})
+            standing_rows.append({"id": uuid.uuid4(), "league_id": league_id, "team_id": team_id,
+                                  "points": rng.randint(0, 60), "position": position})
+
+        # Double round robin per season, spread across the last `seasons` years
+        for season in range(seasons):
+            season_start = now - timedelta(days=365 * (seasons - season - 1) + 180)
+            for round_no, (home, away) in enumerate(
+                (h, a) for h in team_ids for a in team_ids if h != a
+            ):
+                match_date = season_start + timedelta(days=7 * (round_no // (teams_per_league // 2)))
+                completed = match_date < now
+                match_rows.append({
+                    "id": uuid.uuid4(), "match_date": match_date, "home_team_id": home, "away_team_id": away,
+                    "league_id": league_id,
+                    "home_score": rng.randint(0, 4) if completed else None,
+                    "away_score": rng.randint(0, 4) if completed else None,
+                    "status": MatchStatusEnum.COMPLETED if completed else MatchStatusEnum.SCHEDULED,
+                })
+
+    author_id = uuid.uuid4()
+    player_rows = [{
+        "id": uuid.uuid4(), "first_name": f"First{i}", "last_name": f"Last{i}", "position": "CM",
+        "is_captain": False, "status": rng.choice([0, 1, 1, 2]), "goals": rng.randint(0, 30),
+        "assists": rng.randint(0, 30),
+    } for i in range(players)]
+    post_rows = [{
+        "id": uuid.uuid4(), "title": f"Post {i}", "author_id": author_id, "is_published": rng.random() < 0.8,
+        "created_at": now - timedelta(minutes=i),
+    } for i in range(posts)]
+
+    with engine.begin() as conn:
+        conn.execute(insert(League), league_rows)
+        conn.execute(insert(Team), team_rows)
+        conn.execute(insert(LeagueStandings), standing_rows)
+        conn.execute(insert(Match), match_rows)
+        conn.execute(insert(User), [{"id": author_id, "email": "bench@example.com", "hashed_password": "x"}])
+        conn.execute(insert(Player), player_rows)
+        conn.execute(insert(Post), post_rows)
+
+    print(f"Seeded {len(league_rows)} leagues, {len(team_rows)} teams, {len(match_rows)} matches, "
+          f"{len(player_rows)} players, {len(post_rows)} posts")
+    return league_rows[0]["id"], team_rows[0]["id"]
+
+
+def hot_queries(league_id, team_id):
+    now = datetime.now()
+    return {
+        "matches by league": select(Match).where(Match.league_id == league_id).order_by(Match.match_date.asc()),
+        "upcoming for team": select(Match).where(
+            or_(Match.home_team_id == team_id, Match.away_team_id == team_id),
+            Match.match_date >= now,
+            Match.status == MatchStatusEnum.SCHEDULED,
+        ).order_by(Match.match_date.asc()).limit(10),
+        "recent for team": select(Match).where(
+            or_(Match.home_team_id == team_id, Match.away_team_id == team_id),
+            Match.match_date < now,
+            Match.status == MatchStatusEnum.COMPLETED,
+        ).order_by(Match.match_date.desc()).limit(10),
+        "standings by league": select(LeagueStandings).where(
+            LeagueStandings.league_id == league_id
+        ).order_by(LeagueStandings.position.asc()),
+        "roster": select(Player).where(Player.status == 1).order_by(Player.goals.desc(), Player.assists.desc()),
+        "published posts": select(Post).where(Post.is_published.is_(True)).order_by(Post.created_at.desc()).limit(10),
+    }
+
+
+def explain(conn, stmt):
+    # Capture the statement and bound parameters exactly as the driver sees
+    # them, then run the dialect's EXPLAIN on a raw cursor
+    captured = {}
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured["statement"], captured["parameters"] = statement, parameters
+
+    event.listen(conn, "before_cursor_execute", capture)
+    try:
+        conn.execute(stmt).all()
+    finally:
+        event.remove(conn, "before_cursor_execute", capture)
+
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN ANALYZE "
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(prefix + captured["statement"], captured["parameters"])
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    if conn.dialect.name == "sqlite":
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+def run(engine, queries, repeat, label):
+    print(f"\n=== {label} ===")
+    results = {}
+    with engine.connect() as conn:
+        for name, stmt in queries.items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                conn.execute(stmt).all()
+                timings.append((time.perf_counter() - start) * 1000)
+            results[name] = statistics.median(timings)
+            print(f"\n{name}: median {results[name]:.2f} ms over {repeat} runs")
+            for line in explain(conn, stmt):
+                print(f"    {line}")
+    return results
+
+
+def set_indexes(engine, present):
+    indexes = [
+        index
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+        if index.name in HOT_QUERY_INDEXES
+    ]
+    with engine.begin() as conn:
+        for index in indexes:
+            if present:
+                index.create(conn, checkfirst=True)
+            else:
+                index.drop(conn, checkfirst=True)
+        conn.execute(text("ANALYZE"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="scratch database URL (defaults to a temporary SQLite file)")
+    parser.add_argument("--leagues", type=int, default=40)
+    parser.add_argument("--teams", type=int, default=12)
+    parser.add_argument("--seasons", type=int, default=5)
+    parser.add_argument("--players", type=int, default=5000)
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'benchmark_indexes.db')}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+
+    league_id, team_id = seed(engine, args.leagues, args.teams, args.seasons, args.players, args.posts)
+    queries = hot_queries(league_id, team_id)
+
+    set_indexes(engine, present=False)
+    before = run(engine, queries, args.repeat, "without composite indexes")
+    set_indexes(engine, present=True)
+    after = run(engine, queries, args.repeat, "with composite indexes")
+
+    print("\n=== summary (median ms) ===")
+    for name in queries:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:<22} {before[name]:>9.2f} -> {after[name]:>9.2f}  ({speedup:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the JSON serialization path (app/core/serialization.py).
+
+Seeds a scratch SQLite database and loads 1,000 matches with their teams and
+league and 500 players as ORM objects. Each payload is turned into response
+bytes three ways:
+
+- fastapi:  what FastAPI does for `response_model=...`. It validates, converts
+            back to Python dicts and lists, then JSONResponse json.dumps them.
+- double:   the old list_blog_posts pattern: model_validate each row, then
+            the FastAPI path over the validated models.
+- dump_json: one validation from attributes, then pydantic-core writes the bytes.
+
+The script checks that all three produce the same JSON and prints the median
+time of each.
+
+Usage:
+    python benchmark_serialization.py
+    python benchmark_serialization.py --repeat 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.serialization import dump_json
+from app.db.loaders import load_for
+from app.db.session import Base
+from app.models.match_new import Match
+from app.models.player import Player
+from app.models import revoked_token, standings_snapshot  # noqa: F401  (complete metadata for create_all)
+from app.schemas.match import MatchWithTeamsAndLeague
+from app.schemas.player import PlayerRead
+from benchmark_indexes import seed
+
+
+def fastapi_path(schema, rows) -> bytes:
+    field = create_model_field(name="Response", type_=schema, mode="serialization")
+    content = asyncio.run(serialize_response(field=field, response_content=rows, is_coroutine=True))
+    return JSONResponse(content).body
+
+
+def double_path(schema, item_schema, rows) -> bytes:
+    validated = [item_schema.model_validate(row, from_attributes=True) for row in rows]
+    return fastapi_path(schema, validated)
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'benchmark_serialization.db')}")
+    Base.metadata.create_all(bind=engine)
+    seed(engine, leagues=4, teams_per_league=12, seasons=2, players=500, posts=1)
+
+    with Session(engine) as db:
+        payloads = [
+            ("1000 matches", List[MatchWithTeamsAndLeague], MatchWithTeamsAndLeague,
+             load_for(db.query(Match), MatchWithTeamsAndLeague).limit(1000).all()),
+            ("500 players", List[PlayerRead], PlayerRead, db.query(Player).limit(500).all()),
+        ]
+
+        print(f"{'payload':<14} {'bytes':>8} {'fastapi':>10} {'double':>10} {'dump_json':>10} {'speedup':>8}")
+        for label, schema, item_schema, rows in payloads:
+            outputs = {
+                "fastapi": fastapi_path(schema, rows),
+                "double": double_path(schema, item_schema, rows),
+                "dump_json": dump_json(schema, rows),
+            }
+            expected = json.loads(outputs["fastapi"])
+            for name, body in outputs.items():
+                if json.loads(body) != expected:
+                    raise SystemExit(f"{label}: {name} produced different JSON")
+
+            fastapi_ms = timed(lambda: fastapi_path(schema, rows), args.repeat)
+            double_ms = timed(lambda: double_path(schema, item_schema, rows), args.repeat)
+            fast_ms = timed(lambda: dump_json(schema, rows), args.repeat)
+            print(f"{label:<14} {len(outputs['dump_json']):>8} {fastapi_ms:>8.1f}ms {double_ms:>8.1f}ms "
+                  f"{fast_ms:>8.1f}ms {fastapi_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Mixed read/write load through the API on SQLite, with and without the
+SQLite profile (WAL, synchronous=NORMAL, mmap, page cache, busy timeout).
+
+Seeds one SQLite file and copies it for each run, because WAL mode sticks
+to a database file once set. The app is then started under uvicorn with
+SQLITE_PROFILE=off and SQLITE_PROFILE=production. --concurrency keep-alive
+connections cycle through the match list, standings and roster. Every
+--write-every'th request of each connection updates a player's stats
+instead. The script prints throughput, read and write latency percentiles,
+and errors (a 500 is usually "database is locked").
+
+Usage:
+    python benchmark_sqlite_profile.py
+    python benchmark_sqlite_profile.py --concurrency 64 --seconds 20 --write-every 3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, select
+
+from app.db.session import Base
+from app.models.player import Player
+from app.models import revoked_token, standings_snapshot  # noqa: F401  (tables the app reads at startup)
+from benchmark_async_routes import HOST, fetch, serve
+from benchmark_indexes import seed
+
+
+async def client(port, reads, player_ids, write_every, offset, deadline, results):
+    reader, writer = await asyncio.open_connection(HOST, port)
+    rng = random.Random(offset)
+    i = offset
+    try:
+        while time.perf_counter() < deadline:
+            i += 1
+            start = time.perf_counter()
+            if i % write_every == 0:
+                kind = "write"
+                body = json.dumps({
+                    "goals": rng.randint(0, 30), "assists": rng.randint(0, 30), "clean_sheets": 0,
+                    "appearances": rng.randint(0, 40), "yellow_cards": 0, "red_cards": 0,
+                }).encode()
+                status = await fetch(reader, writer, f"/api/admin/update-player-stats/{rng.choice(player_ids)}",
+                                     method="PUT", body=body)
+            else:
+                kind = "read"
+                status = await fetch(reader, writer, reads[i % len(reads)])
+            results[kind].append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                results["errors"].append(status)
+    finally:
+        writer.close()
+
+
+async def load(port, reads, player_ids, write_every, concurrency, seconds):
+    results = {"read": [], "write": [], "errors": []}
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*(
+        client(port, reads, player_ids, write_every, n, deadline, results) for n in range(concurrency)
+    ))
+    return results
+
+
+def percentiles(latencies):
+    if not latencies:
+        return "n/a"
+    latencies = sorted(latencies)
+    return f"p50={statistics.median(latencies):7.1f} ms  p99={latencies[int(len(latencies) * 0.99) - 1]:7.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8768)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=4, help="uvicorn worker processes sharing the file")
+    parser.add_argument("--write-every", type=int, default=5, help="one request in N is a write")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    seeded = os.path.join(workdir, "seeded.db")
+    engine = create_engine(f"sqlite:///{seeded}")
+    Base.metadata.create_all(bind=engine)
+    league_id, _ = seed(engine, leagues=4, teams_per_league=12, seasons=2, players=300, posts=300)
+    with engine.connect() as connection:
+        player_ids = [str(player_id) for player_id in connection.scalars(select(Player.id))]
+    engine.dispose()
+
+    reads = [
+        "/api/matches/?limit=20",
+        f"/api/standings/league/{league_id}",
+        "/players/roster",
+    ]
+
+    results = {}
+    for profile in ("off", "production"):
+        url = f"sqlite:///{os.path.join(workdir, f'{profile}.db')}"
+        shutil.copy(seeded, url[len("sqlite:///"):])
+        server = serve(args.port, url, workers=args.workers, SQLITE_PROFILE=profile, PASSWORD_HASH_WORKERS="0")
+        try:
+            asyncio.run(load(args.port, reads, player_ids, args.write_every, 4, 1))  # warm up
+            run = asyncio.run(load(args.port, reads, player_ids, args.write_every, args.concurrency, args.seconds))
+        finally:
+            server.terminate()
+            server.wait()
+        total = len(run["read"]) + len(run["write"])
+        results[profile] = total / args.seconds
+        print(f"SQLITE_PROFILE={profile:<10} {results[profile]:7.0f} req/s  errors={len(run['errors'])}")
+        print(f"    reads  {len(run['read']):6d}  {percentiles(run['read'])}")
+        print(f"    writes {len(run['write']):6d}  {percentiles(run['write'])}")
+
+    print(f"production / off throughput: {results['production'] / results['off']:.2f}x "
+          f"at {args.concurrency} connections, one write in {args.write_every}")
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
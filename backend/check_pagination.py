@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Cursor pagination harness for the keyset list endpoints.
+
+Seeds a scratch SQLite database with rows whose `created_at` is identical:
+teams inserted in one statement, so CURRENT_TIMESTAMP stores the same second
+without fractional digits, and blog posts inserted the same way. A few rows
+are given microsecond timestamps the way SQLAlchemy writes them. It then
+follows `next_cursor` through every page of each endpoint, ascending and
+descending. It fails unless every row comes back exactly once and the walk
+ends.
+"""
+
+import os
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+
+_db_file = os.path.join(tempfile.mkdtemp(), "pagination.db")
+os.environ["SB_DB_URL"] = f"sqlite:///{_db_file}"
+os.environ.setdefault("SECRET_KEY", "pagination-harness")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ["CACHE_BACKEND"] = "off"
+
+from sqlalchemy import insert
+
+from app.main import app  # noqa: F401  (creates the tables)
+from app.db.session import SessionLocal, engine
+from app.models.blog_posts import Post
+from app.models.league import League, LeagueTypeEnum
+from app.models.team import Team
+from app.models.user import User
+from app.api.routes import blog_posts as blog_post_routes
+from app.api.routes import league as league_routes
+
+ROWS = 7
+
+
+def seed():
+    league_id, author_id = uuid.uuid4(), uuid.uuid4()
+    with engine.begin() as conn:
+        conn.execute(insert(League), [{"id": league_id, "name": "L", "league_type": LeagueTypeEnum.SUNCOAST,
+                                       "season": "2025/2026"}])
+        # No created_at: CURRENT_TIMESTAMP stores the same `YYYY-MM-DD HH:MM:SS` for all of them
+        conn.execute(insert(Team), [{"id": uuid.uuid4(), "name": f"T{i}", "league_id": league_id} for i in range(ROWS)])
+        conn.execute(insert(User), [{"id": author_id, "email": "pages@example.com", "hashed_password": "x"}])
+        conn.execute(insert(Post), [{"id": uuid.uuid4(), "title": f"P{i}", "author_id": author_id} for i in range(ROWS)])
+    # Rows written by the ORM carry fractional seconds; mix some in around the shared second
+    db = SessionLocal()
+    try:
+        shared = db.query(Post.created_at).first()[0]
+        db.add_all([Team(name="late", league_id=league_id, created_at=datetime.now() + timedelta(seconds=5))])
+        db.add_all([
+            Post(title="early", author_id=author_id, created_at=shared - timedelta(microseconds=250)),
+            Post(title="late", author_id=author_id, created_at=shared + timedelta(microseconds=250)),
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def walk(fetch, limit):
+    """Follow next_cursor from the first page; returns (ids, pages) or raises on a loop"""
+    ids, cursor, pages = [], "", 0
+    while True:
+        items, cursor = fetch(cursor, limit)
+        ids += [item.id for item in items]
+        pages += 1
+        if cursor is None:
+            return ids, pages
+        if pages > 100:
+            raise RuntimeError("next_cursor never ends")
+
+
+def main():
+    seed()
+    db = SessionLocal()
+    try:
+        def teams(after, limit):
+            page = league_routes.get_teams(limit=limit, after=after, db=db)
+            return page["items"], page["next_cursor"]
+
+        def posts(after, limit):
+            page = blog_post_routes.list_blog_posts(limit=limit, after=after, db=db)
+            return page["posts"], page["next_cursor"]
+
+        expected = {"get_teams": db.query(Team).count(), "list_blog_posts": db.query(Post).count()}
+        failed = False
+        for name, fetch in (("get_teams", teams), ("list_blog_posts", posts)):
+            for limit in (1, 2, 3):
+                try:
+                    ids, pages = walk(fetch, limit)
+                    ok = len(ids) == len(set(ids)) == expected[name]
+                    detail = f"{len(set(ids))}/{expected[name]} rows in {pages} pages"
+                except RuntimeError as exc:
+                    ok, detail = False, str(exc)
+                failed = failed or not ok
+                print(f"{'ok  ' if ok else 'FAIL'} {name} limit={limit}: {detail}")
+    finally:
+        db.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Query-count harness for the match list endpoints and the single-row writes.
+
+Seeds a scratch SQLite database at two different sizes, calls each list
+route and serializes the result through its response model. It fails if the
+number of SQL statements changes with the number of rows returned.
+
+It then calls each single-row create/update handler and serializes the
+response. It fails unless the write is one statement: an INSERT or UPDATE
+with RETURNING and no reload after the commit. Updates get one SELECT
+before that, to load the row.
+
+Match and team writes also maintain the standings table, its matchday
+snapshots and the head-to-head matrix used for tie-breaks, so they run more
+than one statement. Their expected counts are pinned too, so a hook that
+starts querying more (or once per team or per match) fails the check.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+_db_file = os.path.join(tempfile.mkdtemp(), "query_counts.db")
+os.environ["SB_DB_URL"] = f"sqlite:///{_db_file}"
+os.environ.setdefault("SECRET_KEY", "query-count-harness")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+# Measure the routes themselves, not the response cache in front of them
+os.environ["CACHE_BACKEND"] = "off"
+
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import event
+
+from app.main import app  # noqa: F401  (creates the tables)
+from app.db.session import SessionLocal, engine
+from app.models.league import League, LeagueTypeEnum
+from app.models.team import Team
+from app.models.match_new import Match, MatchStatusEnum
+from app.models.user import User
+from app.api.routes import admin as admin_routes
+from app.api.routes import blog_posts as blog_post_routes
+from app.api.routes import league as league_routes
+from app.api.routes import match as match_routes
+from app.api.routes import player as player_routes
+from app.schemas.admin import UpdatePlayerStats
+from app.schemas.blog_posts import BlogPostCreate, BlogPostRead, BlogPostUpdate
+from app.schemas.league import League as LeagueSchema, LeagueCreate, LeagueUpdate, Team as TeamSchema, TeamUpdate
+from app.schemas.match import Match as MatchSchema, MatchCreate, MatchUpdate, MatchWithTeamsAndLeague
+from app.schemas.player import PlayerCreate, PlayerRead, PlayerUpdate
+from app.services import club_timeline
+
+
+class QueryCounter:
+    """Counts statements sent through the engine while active"""
+
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(statement)
+
+    def __enter__(self):
+        self.count = 0
+        self.statements = []
+        event.listen(engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self)
+
+
+def seed(db, match_count):
+    """Replace all leagues, teams and matches with a fresh schedule"""
+    db.query(Match).delete()
+    db.query(Team).delete()
+    db.query(League).delete()
+
+    league = League(name="Harness League", league_type=LeagueTypeEnum.SUNCOAST, season="2025/2026")
+    db.add(league)
+    db.flush()
+
+    teams = [Team(id=club_timeline.CLUB_TEAM_IDS[0], name="Disston City Soccer Club", league_id=league.id)]
+    teams += [Team(name=f"Opponent {i}", league_id=league.id) for i in range(1, 8)]
+    db.add_all(teams)
+    db.flush()
+
+    now = datetime.now()
+    for i in range(match_count):
+        opponent = teams[1 + i % (len(teams) - 1)]
+        upcoming = i % 2 == 0
+        db.add(Match(
+            match_date=now + timedelta(days=i + 1) if upcoming else now - timedelta(days=i + 1),
+            home_team_id=teams[0].id if i % 4 < 2 else opponent.id,
+            away_team_id=opponent.id if i % 4 < 2 else teams[0].id,
+            league_id=league.id,
+            home_score=None if upcoming else 2,
+            away_score=None if upcoming else 1,
+            status=MatchStatusEnum.SCHEDULED if upcoming else MatchStatusEnum.COMPLETED,
+        ))
+    db.commit()
+    # Seeding bypasses the match routes, so drop the club timeline by hand
+    club_timeline.invalidate()
+    return league.id, teams[0].id
+
+
+def measure(match_count):
+    """Return {endpoint: (rows, statements)} for a schedule of the given size"""
+    adapter = TypeAdapter(List[MatchWithTeamsAndLeague])
+    db = SessionLocal()
+    try:
+        league_id, team_id = seed(db, match_count)
+        calls = {
+            "get_matches": lambda: match_routes.get_matches(skip=0, limit=match_count, db=db),
+            "get_matches_by_league": lambda: match_routes.get_matches_by_league(league_id=league_id, db=db),
+            "get_matches_by_team": lambda: match_routes.get_matches_by_team(team_id=team_id, db=db),
+            "get_upcoming_matches": lambda: match_routes.get_upcoming_matches(limit=match_count, db=db),
+            "get_recent_matches": lambda: match_routes.get_recent_matches(limit=match_count, db=db),
+        }
+        results = {}
+        for name, call in calls.items():
+            db.expire_all()
+            with QueryCounter() as counter:
+                rows = adapter.validate_python(call(), from_attributes=True)
+            results[name] = (len(rows), counter.count)
+        return results
+    finally:
+        db.close()
+
+
+def measure_writes():
+    """Return {handler: (expected statements, statements run)} for each single-row write"""
+    db = SessionLocal()
+    try:
+        author = User(email="harness@example.com", hashed_password="x")
+        db.add(author)
+        db.commit()
+        # The schedule measure() left behind: its league and two of the opponents. A draw between
+        # them is ranked by team id, so the home team starts second and update_match's home win
+        # always moves both teams
+        league = db.query(League).filter(League.name == "Harness League").one()
+        away, home = sorted(db.query(Team).filter(
+            Team.league_id == league.id, Team.id.notin_(club_timeline.CLUB_TEAM_IDS)
+        ).order_by(Team.name).limit(2).all(), key=lambda team: str(team.id))
+
+        created = {}
+        stats = UpdatePlayerStats(goals=3, assists=1, clean_sheets=0, appearances=4, yellow_cards=0, red_cards=0)
+        # (name, expected statements, call, response model); updates load the row first
+        writes = [
+            ("create_league", 1, lambda: league_routes.create_league(
+                LeagueCreate(name="Write League", league_type=LeagueTypeEnum.SUNCOAST, season="2025/2026"), db=db
+            ), LeagueSchema),
+            ("update_league", 2, lambda: league_routes.update_league(
+                created["create_league"].id, LeagueUpdate(name="Renamed League"), db=db
+            ), LeagueSchema),
+            ("create_player", 1, lambda: player_routes.create_player(
+                PlayerCreate(first_name="Harness", last_name="Player", position="CM"), db=db
+            ), PlayerRead),
+            ("approve_player", 2, lambda: player_routes.approve_player(created["create_player"].id, db=db), PlayerRead),
+            ("edit_player", 2, lambda: player_routes.edit_player(
+                created["create_player"].id, PlayerUpdate(goals=1), db=db
+            ), PlayerRead),
+            ("update_player_stats", 2, lambda: admin_routes.update_player_stats(
+                created["create_player"].id, stats, db=db
+            ), PlayerRead),
+            ("create_blog_post", 1, lambda: blog_post_routes.create_blog_post(
+                BlogPostCreate(title="Harness post"), db=db, current_user=author
+            ), BlogPostRead),
+            ("update_blog_post", 2, lambda: blog_post_routes.update_blog_post(
+                created["create_blog_post"].id, BlogPostUpdate(title="Edited post"), db=db
+            ), BlogPostRead),
+            # A drawn result: the match INSERT; load and create both teams' standings rows; re-rank the
+            # league, building the head-to-head matrix for the tie; rewrite that matchday's snapshot
+            ("create_match", 13, lambda: match_routes.create_match(MatchCreate(
+                match_date=datetime.now() - timedelta(hours=1), home_team_id=home.id, away_team_id=away.id,
+                league_id=league.id, home_score=1, away_score=1, status=MatchStatusEnum.COMPLETED,
+            ), db=db), MatchSchema),
+            # Load the match; update both standings rows and the match; re-rank, swapping the two
+            # positions (no tie left, so no matrix); rewrite the matchday snapshot
+            ("update_match", 13, lambda: match_routes.update_match(
+                created["create_match"].id, MatchUpdate(home_score=3), db=db
+            ), MatchSchema),
+            # Load and UPDATE; the head-to-head and cache invalidation run after commit without queries
+            ("update_team", 2, lambda: league_routes.update_team(
+                home.id, TeamUpdate(name="Renamed Opponent"), db=db
+            ), TeamSchema),
+        ]
+        results = {}
+        for name, expected, call, response_model in writes:
+            adapter = TypeAdapter(response_model)
+            with QueryCounter() as counter:
+                created[name] = call()
+                adapter.validate_python(created[name], from_attributes=True)
+            results[name] = (expected, counter.statements)
+        return results
+    finally:
+        db.close()
+
+
+def main():
+    small = measure(10)
+    large = measure(200)
+
+    failed = False
+    for name in small:
+        small_rows, small_queries = small[name]
+        large_rows, large_queries = large[name]
+        ok = small_queries == large_queries
+        failed = failed or not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {name}: {small_queries} queries for {small_rows} rows, "
+              f"{large_queries} queries for {large_rows} rows")
+
+    for name, (expected, statements) in measure_writes().items():
+        ok = len(statements) == expected
+        failed = failed or not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {name}: {len(statements)} statements, expected {expected}")
+        if not ok:
+            for statement in statements:
+                print(f"       {' '.join(statement.split())[:120]}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Load test: does a burst of logins slow down the rest of the API?
+
+Starts the app under uvicorn against a scratch SQLite database (or targets
+--url), registers a user, then measures GET /health latency twice: alone,
+and while --concurrency clients hammer POST /auth/login. It also reports
+how many logins succeeded and how many were turned away with 503 once the
+password hashing queue was full.
+
+Usage:
+    python load_test_login_burst.py
+    python load_test_login_burst.py --logins 400 --concurrency 64
+    python load_test_login_burst.py --url http://localhost:8000   # running server
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+def request(url, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=60) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as error:
+        return error.code
+
+
+def wait_until_up(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if request(url + "/health") == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server at {url} did not come up")
+
+
+def probe(url, stop, latencies):
+    """Time GET /health back to back until `stop` is set"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        request(url + "/health")
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.01)
+
+
+def summarize(label, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) >= 20 else latencies[-1]
+    print(f"{label:<22} n={len(latencies):<5} p50={statistics.median(latencies):7.1f} ms  "
+          f"p95={p95:7.1f} ms  max={latencies[-1]:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="base URL of a running server (default: start one)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--baseline-seconds", type=float, default=3)
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        url = f"http://127.0.0.1:{args.port}"
+        env = dict(os.environ)
+        env.setdefault("SB_DB_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'login_burst.db')}")
+        env.setdefault("SECRET_KEY", "login-burst")
+        env.setdefault("ALGORITHM", "HS256")
+        env.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=env,
+        )
+    try:
+        wait_until_up(url)
+        credentials = {"email": f"burst-{uuid.uuid4().hex[:8]}@example.com", "password": "burst-password"}
+        request(url + "/auth/register", credentials)
+
+        stop, baseline = threading.Event(), []
+        prober = threading.Thread(target=probe, args=(url, stop, baseline))
+        prober.start()
+        time.sleep(args.baseline_seconds)
+        stop.set()
+        prober.join()
+
+        stop, during = threading.Event(), []
+        prober = threading.Thread(target=probe, args=(url, stop, during))
+        prober.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            statuses = list(pool.map(lambda _: request(url + "/auth/login", credentials), range(args.logins)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        prober.join()
+
+        print(f"{args.logins} logins from {args.concurrency} clients in {elapsed:.1f}s: "
+              + ", ".join(f"{code} x{statuses.count(code)}" for code in sorted(set(statuses))))
+        summarize("GET /health idle", baseline)
+        summarize("GET /health in burst", during)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
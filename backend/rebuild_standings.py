@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Rebuild league standings from match results.
+
+Every league is rebuilt concurrently, each in its own session and
+transaction, using the set-based aggregate in app.services.standings_service.
+With --verify nothing is written: the stored tables are compared against the
+ground truth and any drift is reported (exit status 1 if there is drift).
+
+Usage:
+    python rebuild_standings.py                       # all leagues, thread pool
+    python rebuild_standings.py --mode process -w 8   # all leagues, process pool
+    python rebuild_standings.py --league <uuid> --verify
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from uuid import UUID
+
+from app.core.cache import invalidate_on_commit
+from app.db.session import SessionLocal, engine
+from app.models.league import League
+from app.models.team import Team
+from app.models.league_standings import LeagueStandings
+from app.models.match_new import Match
+from app.services.standings_service import rebuild_standings, standings_drift
+
+
+def rebuild_league(league_id: UUID, verify: bool):
+    """Rebuild (or verify) one league in its own session; returns (league_id, count)"""
+    db = SessionLocal()
+    try:
+        if verify:
+            return league_id, standings_drift(db, league_id)
+        changed = rebuild_standings(db, league_id)
+        # Reaches running servers only through a shared (redis) cache backend
+        invalidate_on_commit(db, "standings", f"league:{league_id}")
+        db.commit()
+        return league_id, changed
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _reset_engine():
+    # Forked workers must not reuse the parent's pooled connections
+    engine.dispose(close=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--league", action="append", type=UUID, help="league id (repeatable; default: all leagues)")
+    parser.add_argument("-w", "--workers", type=int, default=4)
+    parser.add_argument("--mode", choices=("thread", "process"), default="thread")
+    parser.add_argument("--verify", action="store_true", help="report drift without writing")
+    args = parser.parse_args()
+
+    league_ids = args.league
+    if not league_ids:
+        db = SessionLocal()
+        try:
+            league_ids = [league_id for (league_id,) in db.query(League.id)]
+        finally:
+            db.close()
+
+    if args.mode == "process":
+        pool = ProcessPoolExecutor(max_workers=args.workers, initializer=_reset_engine)
+    else:
+        pool = ThreadPoolExecutor(max_workers=args.workers)
+
+    start = time.perf_counter()
+    drifted = 0
+    with pool:
+        futures = [pool.submit(rebuild_league, league_id, args.verify) for league_id in league_ids]
+        for future in as_completed(futures):
+            league_id, outcome = future.result()
+            if args.verify:
+                drifted += bool(outcome)
+                print(f"{league_id}: {'OK' if not outcome else f'{len(outcome)} drifted values'}")
+                for team_id, field, stored, expected in outcome:
+                    print(f"    team {team_id} {field}: stored {stored}, expected {expected}")
+            else:
+                print(f"{league_id}: {outcome} rows updated")
+
+    elapsed = time.perf_counter() - start
+    print(f"\n{'Verified' if args.verify else 'Rebuilt'} {len(league_ids)} leagues in {elapsed:.2f}s")
+    return 1 if drifted else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())